@@ -12,31 +12,94 @@ Usage:
     cdk deploy -c environment=dev -c stack_type=minimal
 """
 import sys
-from typing import Optional
-
-import aws_cdk as cdk
+from fnmatch import fnmatchcase
+from typing import TYPE_CHECKING, Callable, Iterable, Mapping, Optional, Set, Tuple
 
 from n8n_deploy.config import ConfigLoader
-from n8n_deploy.config.models import DatabaseType
-from n8n_deploy.stacks import AccessStack, ComputeStack, NetworkStack, StorageStack
 
+if TYPE_CHECKING:
+    import aws_cdk as cdk
+
+# Upstream stacks each stack needs to exist in the same assembly
+STACK_DEPENDENCIES = {
+    "network": (),
+    "storage": ("network",),
+    "database": ("network",),
+    "compute": ("network", "storage", "database"),
+    "access": ("compute",),
+    "monitoring": ("compute", "storage", "database"),
+}
+
+# Downstream stacks consuming each stack's outputs (the reverse of STACK_DEPENDENCIES)
+STACK_CONSUMERS = {
+    name: tuple(consumer for consumer, upstream in STACK_DEPENDENCIES.items() if name in upstream)
+    for name in STACK_DEPENDENCIES
+}
+
+
+def get_stack_filter(app: "cdk.App", stack_prefix: str) -> Callable[[str], bool]:
+    """Build a predicate telling whether a stack is needed for this CDK invocation.
+
+    The CDK CLI passes the stack selectors given on the command line (e.g.
+    ``cdk deploy myapp-dev-compute``) through the ``aws:cdk:bundling-stacks``
+    context key. Matching stacks are kept together with their downstream
+    consumers, because CDK only emits the ``ExportsOutput*`` exports of a
+    producer for consumers present in the assembly, and removing exports the
+    deployed consumers still import would fail the update. Everything upstream
+    of those stacks is kept as well; the remaining stacks are skipped so they
+    are never constructed.
+
+    Args:
+        app: CDK application
+        stack_prefix: Prefix shared by all stack names of this environment
 
-def create_stacks(app: cdk.App, environment: str, stack_type: Optional[str] = None) -> None:
+    Returns:
+        Function taking a stack key (network, storage, ...) and returning True if it should be created
+    """
+    selectors = app.node.try_get_context("aws:cdk:bundling-stacks")
+    if not selectors or "**" in selectors or "*" in selectors:
+        return lambda name: True
+
+    selected = [name for name in STACK_DEPENDENCIES if any(fnmatchcase(f"{stack_prefix}-{name}", s) for s in selectors)]
+    consumers = _closure(selected, STACK_CONSUMERS)
+    return _closure(consumers, STACK_DEPENDENCIES).__contains__
+
+
+def _closure(names: Iterable[str], edges: Mapping[str, Tuple[str, ...]]) -> Set[str]:
+    """Collect the given stack keys and everything reachable from them through ``edges``."""
+    reached = set()
+    pending = list(names)
+    while pending:
+        name = pending.pop()
+        if name not in reached:
+            reached.add(name)
+            pending.extend(edges[name])
+    return reached
+
+
+def get_config_loader(app: "cdk.App") -> ConfigLoader:
+    """Create a config loader honouring the optional ``config_path`` context value."""
+    return ConfigLoader(app.node.try_get_context("config_path") or "system.yaml")
+
+
+def create_stacks(
+    app: "cdk.App",
+    environment: str,
+    stack_type: Optional[str] = None,
+    config_loader: Optional[ConfigLoader] = None,
+) -> None:
     """Create all stacks for the specified environment.
 
     Args:
         app: CDK application
         environment: Environment name from system.yaml
         stack_type: Optional stack type (minimal, standard, enterprise)
+        config_loader: Optional loader to reuse; created from the app context if omitted
     """
     # Load configuration
     try:
-        # Check if a custom config path is provided
-        config_path = app.node.try_get_context("config_path")
-        if config_path:
-            config_loader = ConfigLoader(config_path)
-        else:
-            config_loader = ConfigLoader()
+        if config_loader is None:
+            config_loader = get_config_loader(app)
         config = config_loader.load_config(environment, stack_type)
     except FileNotFoundError:
         print("Error: system.yaml not found. Please create a system.yaml file.")
@@ -51,27 +114,42 @@ def create_stacks(app: cdk.App, environment: str, stack_type: Optional[str] = No
         print(f"Error: Environment '{environment}' not found in configuration")
         sys.exit(1)
 
+    # Import CDK, the stack modules and the config enums only once stacks are actually built
+    import aws_cdk as cdk
+
+    from n8n_deploy.config.models import DatabaseType
+    from n8n_deploy.stacks import AccessStack, ComputeStack, NetworkStack, StorageStack
+
     # Create stack name prefix
     stack_prefix = f"{config.global_config.project_name}-{environment}"
 
+    # Settings consulted by the component selection below
+    settings = env_config.settings
+    features = settings.features or {}
+    database = settings.database
+    uses_postgres = bool(database and database.type == DatabaseType.POSTGRES)
+    has_networking = bool(settings.networking)
+
     # Determine which components to create
-    components = []
-    if env_config.settings.features and "components" in env_config.settings.features:
-        components = env_config.settings.features["components"]
+    if "components" in features:
+        components = set(features["components"])
     else:
         # Default components based on configuration
-        components = ["network", "storage", "compute", "access"]
-        if env_config.settings.database and env_config.settings.database.type == DatabaseType.POSTGRES:
-            components.append("database")
-        if env_config.settings.monitoring:
-            components.append("monitoring")
+        components = {"network", "storage", "compute", "access"}
+        if uses_postgres:
+            components.add("database")
+        if settings.monitoring:
+            components.add("monitoring")
+
+    # Only build stacks requested on the command line (plus what they depend on)
+    needs = get_stack_filter(app, stack_prefix)
 
     # Create CDK environment
     cdk_env = cdk.Environment(account=env_config.account, region=env_config.region)
 
     # Create network stack
     network_stack = None
-    if "network" in components or env_config.settings.networking:
+    if needs("network") and ("network" in components or has_networking):
         network_stack = NetworkStack(
             app,
             f"{stack_prefix}-network",
@@ -82,7 +160,7 @@ def create_stacks(app: cdk.App, environment: str, stack_type: Optional[str] = No
 
     # Create storage stack
     storage_stack = None
-    if "storage" in components or "efs" in components:
+    if needs("storage") and ("storage" in components or "efs" in components):
         if not network_stack:
             raise ValueError("Storage stack requires network stack")
         storage_stack = StorageStack(
@@ -96,11 +174,10 @@ def create_stacks(app: cdk.App, environment: str, stack_type: Optional[str] = No
 
     # Create database stack if needed
     database_stack = None
-    database_endpoint = None
+    database_host = None
+    database_port = None
     database_secret = None
-    if "database" in components or (
-        env_config.settings.database and env_config.settings.database.type == DatabaseType.POSTGRES
-    ):
+    if needs("database") and ("database" in components or uses_postgres):
         # Import DatabaseStack when needed
         from n8n_deploy.stacks import DatabaseStack
 
@@ -115,12 +192,13 @@ def create_stacks(app: cdk.App, environment: str, stack_type: Optional[str] = No
             network_stack=network_stack,
             env=cdk_env,
         )
-        database_endpoint = database_stack.endpoint
+        database_host = database_stack.endpoint_address
+        database_port = database_stack.endpoint_port
         database_secret = database_stack.secret
 
     # Create compute stack
     compute_stack = None
-    if "compute" in components or "fargate" in components:
+    if needs("compute") and ("compute" in components or "fargate" in components):
         if not network_stack or not storage_stack:
             raise ValueError("Compute stack requires network and storage stacks")
 
@@ -131,13 +209,14 @@ def create_stacks(app: cdk.App, environment: str, stack_type: Optional[str] = No
             environment=environment,
             network_stack=network_stack,
             storage_stack=storage_stack,
-            database_endpoint=database_endpoint,
+            database_host=database_host,
+            database_port=database_port,
             database_secret=database_secret,
             env=cdk_env,
         )
 
     # Create access stack
-    if "access" in components or "api_gateway" in components:
+    if needs("access") and ("access" in components or "api_gateway" in components):
         if not compute_stack:
             raise ValueError("Access stack requires compute stack")
 
@@ -151,7 +230,7 @@ def create_stacks(app: cdk.App, environment: str, stack_type: Optional[str] = No
         )
 
     # Create monitoring stack if enabled
-    if "monitoring" in components:
+    if needs("monitoring") and "monitoring" in components:
         # Import MonitoringStack when needed
         from n8n_deploy.stacks import MonitoringStack
 
@@ -166,19 +245,27 @@ def create_stacks(app: cdk.App, environment: str, stack_type: Optional[str] = No
             env=cdk_env,
         )
 
-    # Add tags to all stacks
-    cdk.Tags.of(app).add("Environment", environment)
-    cdk.Tags.of(app).add("Project", config.global_config.project_name)
-    cdk.Tags.of(app).add("ManagedBy", "CDK")
-
+    # Add tags to all stacks. Tags aspects write them into every template, unlike the tags= stack prop.
+    tags = {
+        "Environment": environment,
+        "Project": config.global_config.project_name,
+        "ManagedBy": "CDK",
+    }
     if stack_type:
-        cdk.Tags.of(app).add("StackType", stack_type)
+        tags["StackType"] = stack_type
+    for key, value in tags.items():
+        cdk.Tags.of(app).add(key, value)
 
 
 def main():
     """Main entry point for the CDK application."""
+    import aws_cdk as cdk
+
     app = cdk.App()
 
+    # Single loader shared by the error hint below and create_stacks, so the file is parsed once
+    config_loader = get_config_loader(app)
+
     # Get environment from context
     environment = app.node.try_get_context("environment")
     if not environment:
@@ -188,8 +275,7 @@ def main():
 
         # Try to list available environments
         try:
-            config_loader = ConfigLoader()
-            environments = config_loader.get_available_environments()
+            environments = config_loader.peek_environments()
             if environments:
                 print(f"\nAvailable environments: {', '.join(environments)}")
         except Exception:
@@ -201,7 +287,7 @@ def main():
     stack_type = app.node.try_get_context("stack_type")
 
     # Create stacks
-    create_stacks(app, environment, stack_type)
+    create_stacks(app, environment, stack_type, config_loader=config_loader)
 
     app.synth()
 
@@ -0,0 +1,23 @@
+"""Small helpers shared by stacks and constructs."""
+
+from bisect import bisect_left
+from typing import Sequence
+
+
+def nearest(sorted_keys: Sequence[int], value: int) -> int:
+    """Find the key closest to a value.
+
+    Args:
+        sorted_keys: Non-empty keys in ascending order
+        value: Requested value
+
+    Returns:
+        Closest key; ties resolve to the smaller one
+    """
+    idx = bisect_left(sorted_keys, value)
+    if idx == 0:
+        return sorted_keys[0]
+    if idx == len(sorted_keys):
+        return sorted_keys[-1]
+    lower, upper = sorted_keys[idx - 1], sorted_keys[idx]
+    return lower if value - lower <= upper - value else upper
@@ -1,13 +1,142 @@
 """Configuration loader for system.yaml."""
 
+import functools
+import hashlib
+import json
+import os
+import pickle  # nosec B403 - only reads files this tool wrote to the user's own cache dir
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Mapping, Optional, Tuple
 
+import pydantic
 import yaml
 from pydantic import ValidationError
 
+from . import models
+from ._yaml import SafeDumper as _SafeDumper
+from ._yaml import SafeLoader as _SafeLoader
 from .models import EnvironmentConfig, N8nConfig
 
+# Parsed YAML keyed by resolved path, tagged with the (st_mtime_ns, st_size)
+# signature it was parsed from so edits to the file invalidate the entry
+_YAML_CACHE: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
+# Opt-in flag for persisting a JSON shadow of the parsed YAML next to the file
+YAML_CACHE_ENV_VAR = "N8N_DEPLOY_YAML_CACHE"
+
+# Opt-in flag for persisting the validated N8nConfig as a pickle in the user cache dir
+PICKLE_CACHE_ENV_VAR = "N8N_DEPLOY_PICKLE_CACHE"
+
+
+# Written by ConfigLoader.generate_example_config
+_EXAMPLE_CONFIG: Dict[str, Any] = {
+    "global": {
+        "project_name": "n8n-deploy",
+        "organization": "mycompany",
+        "tags": {
+            "Project": "n8n",
+            "ManagedBy": "CDK",
+            "Environment": "{{ environment }}",
+        },
+    },
+    "defaults": {
+        "fargate": {"cpu": 256, "memory": 512, "spot_percentage": 80},
+        "monitoring": {
+            "log_retention_days": 30,
+            "enable_container_insights": True,
+        },
+    },
+    "environments": {
+        "dev": {
+            "account": "123456789012",
+            "region": "us-east-1",
+            "settings": {
+                "fargate": {"cpu": 256, "memory": 512},
+                "scaling": {"min_tasks": 1, "max_tasks": 1},
+                "networking": {
+                    "use_existing_vpc": False,
+                    "vpc_cidr": "10.0.0.0/16",
+                },
+                "access": {
+                    "cloudfront_enabled": False,
+                    "api_gateway_throttle": 100,
+                },
+                "auth": {"basic_auth_enabled": True, "oauth_enabled": False},
+            },
+        },
+        "production": {
+            "account": "123456789013",
+            "region": "us-west-2",
+            "settings": {
+                "fargate": {"cpu": 1024, "memory": 2048, "spot_percentage": 50},
+                "scaling": {
+                    "min_tasks": 2,
+                    "max_tasks": 10,
+                    "target_cpu_utilization": 70,
+                },
+                "networking": {
+                    "use_existing_vpc": True,
+                    "vpc_id": "vpc-prod12345",
+                    "subnet_ids": ["subnet-1", "subnet-2"],
+                },
+                "access": {
+                    "domain_name": "n8n.example.com",
+                    "cloudfront_enabled": True,
+                    "waf_enabled": True,
+                    "api_gateway_throttle": 10000,
+                },
+                "database": {"type": "postgres", "use_existing": False},
+                "auth": {
+                    "basic_auth_enabled": False,
+                    "oauth_enabled": True,
+                    "oauth_provider": "okta",
+                },
+            },
+        },
+    },
+    "stacks": {
+        "minimal": {
+            "description": "Minimal setup for personal use",
+            "components": ["fargate", "efs", "api_gateway"],
+            "settings": {"fargate": {"cpu": 256, "memory": 512}},
+        },
+        "standard": {
+            "description": "Standard setup with monitoring",
+            "components": [
+                "fargate",
+                "efs",
+                "api_gateway",
+                "cloudfront",
+                "monitoring",
+            ],
+            "inherit_from": "defaults",
+        },
+    },
+}
+
+
+@functools.lru_cache(maxsize=64)
+def _resolve_config(name: str, cwd: str) -> Path:
+    """Find a config file by name in ``cwd`` or the closest parent directory.
+
+    Args:
+        name: Config file name
+        cwd: Directory to start the upward search from
+
+    Returns:
+        Path of the first matching file
+
+    Raises:
+        FileNotFoundError: If no directory up to the root contains the file
+    """
+    current = Path(cwd)
+    while current != current.parent:
+        potential_config = current / name
+        if potential_config.exists():
+            return potential_config
+        current = current.parent
+    raise FileNotFoundError(f"Configuration file '{name}' not found")
+
 
 class ConfigLoader:
     """Load and validate configuration from system.yaml."""
@@ -21,6 +150,7 @@ class ConfigLoader:
         self.config_file = Path(config_file)
         self._config: Optional[N8nConfig] = None
         self._raw_config: Optional[Dict[str, Any]] = None
+        self._env_names: Optional[Tuple[str, ...]] = None
 
     def load_config(
         self,
@@ -42,12 +172,12 @@ class ConfigLoader:
             FileNotFoundError: If config file doesn't exist
             ValueError: If environment not found or validation fails
         """
-        # Load raw configuration
-        if not self._raw_config:
-            self._load_raw_config()
-
-        # Validate base configuration
         if not self._config:
+            # Load raw configuration
+            if not self._raw_config:
+                self._load_raw_config()
+
+            # Validate base configuration
             self._validate_config()
 
         # Get environment configuration
@@ -68,50 +198,187 @@ class ConfigLoader:
         if overrides:
             env_config = self._apply_overrides(env_config, overrides)
 
-        # Create a new config with only the selected environment
-        # We need to recreate from dictionaries to create a new instance
-        config_dict = {
-            "global": self._config.global_config.model_dump(),
-            "environments": {environment: env_config.model_dump()},
-        }
-        if self._config.defaults:
-            config_dict["defaults"] = self._config.defaults.model_dump()
-        if self._config.stacks:
-            config_dict["stacks"] = {k: v.model_dump() for k, v in self._config.stacks.items()}
-        if self._config.shared_resources:
-            config_dict["shared_resources"] = self._config.shared_resources.model_dump()
-
-        # Create new config from the dictionary
-        selected_config = N8nConfig.model_validate(config_dict)
+        # Create a new config with only the selected environment. Every section
+        # has already been validated, so skip a second validation pass.
+        selected_config = N8nConfig.model_construct(
+            global_config=self._config.global_config,
+            defaults=self._config.defaults,
+            environments={environment: env_config},
+            stacks=self._config.stacks,
+            shared_resources=self._config.shared_resources,
+        )
 
         return selected_config
 
+    def load_from_dict(
+        self,
+        data: Mapping[str, Any],
+        environment: str,
+        stack_type: Optional[str] = None,
+        overrides: Optional[Dict[str, Any]] = None,
+    ) -> N8nConfig:
+        """Load configuration for an environment from an already parsed mapping.
+
+        Runs the same validation and merging as load_config without reading or
+        parsing a YAML file.
+
+        Args:
+            data: Configuration mapping in the system.yaml layout
+            environment: Environment name (dev, staging, production)
+            stack_type: Optional stack type (minimal, standard, enterprise)
+            overrides: Optional configuration overrides
+
+        Returns:
+            Validated N8nConfig object
+
+        Raises:
+            ValueError: If environment not found or validation fails
+        """
+        try:
+            self._config = N8nConfig.load(data)
+        except ValidationError as e:
+            raise ValueError(f"Configuration validation failed: {e}")
+        return self.load_config(environment, stack_type=stack_type, overrides=overrides)
+
     def _load_raw_config(self) -> None:
         """Load raw YAML configuration."""
         if not self.config_file.exists():
             # Try to find config file in parent directories
-            current = Path.cwd()
-            while current != current.parent:
-                potential_config = current / self.config_file.name
-                if potential_config.exists():
-                    self.config_file = potential_config
-                    break
-                current = current.parent
-            else:
-                raise FileNotFoundError(f"Configuration file '{self.config_file}' not found")
-
-        with open(self.config_file, "r") as f:
-            self._raw_config = yaml.safe_load(f)
+            try:
+                self.config_file = _resolve_config(self.config_file.name, str(Path.cwd()))
+            except FileNotFoundError:
+                raise FileNotFoundError(f"Configuration file '{self.config_file}' not found") from None
+
+        resolved = str(self.config_file.resolve())
+        stat = os.stat(resolved)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        cached = _YAML_CACHE.get(resolved)
+        if cached and cached[0] == signature:
+            self._raw_config = cached[1]
+            return
+
+        use_shadow = os.environ.get(YAML_CACHE_ENV_VAR) == "1"
+        shadow_path = self.config_file.with_name(f".{self.config_file.name}.cache.json")
+        if use_shadow and self._load_shadow_cache(shadow_path, signature):
+            _YAML_CACHE[resolved] = (signature, self._raw_config)
+            return
+
+        # Hand libyaml raw bytes so it can skip the Python text-decode step
+        self._raw_config = yaml.load(self.config_file.read_bytes(), Loader=_SafeLoader)
+        _YAML_CACHE[resolved] = (signature, self._raw_config)
+
+        if use_shadow:
+            self._write_shadow_cache(shadow_path, signature)
+
+    def _load_shadow_cache(self, shadow_path: Path, signature: Tuple[int, int]) -> bool:
+        """Load the JSON shadow of the config file if it was written from the current YAML.
+
+        The shadow records the (st_mtime_ns, st_size) signature of the YAML it was
+        parsed from, so a restored or copied system.yaml with an older mtime is
+        never answered from a shadow of different contents.
+
+        Args:
+            shadow_path: Path of the JSON shadow file
+            signature: (st_mtime_ns, st_size) of the YAML file
+
+        Returns:
+            True if the raw configuration was loaded from the shadow file
+        """
+        try:
+            shadow = json.loads(shadow_path.read_bytes())
+            if tuple(shadow["signature"]) != signature:
+                return False
+            self._raw_config = shadow["config"]
+        except (OSError, ValueError, TypeError, KeyError):
+            return False
+        return True
+
+    def _write_shadow_cache(self, shadow_path: Path, signature: Tuple[int, int]) -> None:
+        """Persist the parsed configuration as JSON next to the config file.
+
+        Args:
+            shadow_path: Path of the JSON shadow file
+            signature: (st_mtime_ns, st_size) of the YAML file the configuration was parsed from
+        """
+        try:
+            shadow = json.dumps({"signature": list(signature), "config": self._raw_config})
+            # JSON turns non-string keys into strings; only keep shadows that read back identically
+            if json.loads(shadow)["config"] != self._raw_config:
+                return
+            shadow_path.write_text(shadow)
+        except (OSError, TypeError, ValueError):
+            # Read-only checkouts or YAML values without a JSON form just skip the shadow
+            pass
 
     def _validate_config(self) -> None:
         """Validate configuration against Pydantic models."""
+        use_pickle = os.environ.get(PICKLE_CACHE_ENV_VAR) == "1"
+        pickle_path = self._pickle_cache_path() if use_pickle else None
+        if pickle_path and self._load_pickle_cache(pickle_path):
+            self._raw_config = None
+            return
+
         try:
             if not self._raw_config:
                 raise ValueError("No configuration loaded")
-            self._config = N8nConfig.model_validate(self._raw_config)
+            self._config = N8nConfig.load(self._raw_config)
         except ValidationError as e:
             raise ValueError(f"Configuration validation failed: {e}")
 
+        if pickle_path:
+            self._write_pickle_cache(pickle_path)
+
+        # The validated models carry everything needed from here on, so drop the
+        # loader's reference to the raw dict (config_file still points at the source)
+        self._raw_config = None
+
+    def _pickle_cache_path(self) -> Path:
+        """Get the pickle cache path for the current config file contents.
+
+        The key covers the config file bytes plus the models source and Pydantic
+        version, so edits to either the YAML or the schema invalidate the entry.
+
+        Returns:
+            Path of the pickle file in the user cache directory
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.config_file.read_bytes())
+        digest.update(Path(models.__file__).read_bytes())
+        digest.update(pydantic.VERSION.encode())
+        cache_dir = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "n8n_deploy"
+        return cache_dir / f"{digest.hexdigest()}.pkl"
+
+    def _load_pickle_cache(self, pickle_path: Path) -> bool:
+        """Load a previously validated configuration from the pickle cache.
+
+        Args:
+            pickle_path: Path of the pickle file
+
+        Returns:
+            True if the validated configuration was loaded from the cache
+        """
+        try:
+            config = pickle.loads(pickle_path.read_bytes())  # nosec B301 - see import note
+        except Exception:
+            return False
+        if not isinstance(config, N8nConfig):
+            return False
+        self._config = config
+        return True
+
+    def _write_pickle_cache(self, pickle_path: Path) -> None:
+        """Persist the validated configuration to the pickle cache.
+
+        Args:
+            pickle_path: Path of the pickle file
+        """
+        try:
+            pickle_path.parent.mkdir(parents=True, exist_ok=True)
+            pickle_path.write_bytes(pickle.dumps(self._config))
+        except (OSError, pickle.PicklingError):
+            pass
+
     def _apply_stack_type(self, env_config: EnvironmentConfig, stack_type: str) -> EnvironmentConfig:
         """Apply stack type configuration to environment.
 
@@ -128,23 +395,21 @@ class ConfigLoader:
         if not stack_config:
             raise ValueError(f"Stack type '{stack_type}' not found in configuration")
 
-        # Create a copy to avoid modifying original
-        modified_config = env_config.model_copy(deep=True)
+        settings = env_config.settings
+        updates: Dict[str, Any] = {}
 
         # Apply stack settings
         # Update components list if specified
         if stack_config.components:
             # This would be used by the CDK app to determine which stacks to create
-            modified_config.settings.features = modified_config.settings.features or {}
-            modified_config.settings.features["components"] = stack_config.components
+            updates["features"] = {**(settings.features or {}), "components": stack_config.components}
 
         # Apply other stack settings
         if stack_config.settings:
-            for key, value in stack_config.settings.items():
-                if hasattr(modified_config.settings, key):
-                    setattr(modified_config.settings, key, value)
+            valid_fields = type(settings).model_fields
+            updates.update({key: value for key, value in stack_config.settings.items() if key in valid_fields})
 
-        return modified_config
+        return self._update_settings(env_config, updates)
 
     def _apply_overrides(self, env_config: EnvironmentConfig, overrides: Dict[str, Any]) -> EnvironmentConfig:
         """Apply runtime overrides to configuration.
@@ -156,23 +421,68 @@ class ConfigLoader:
         Returns:
             Modified environment configuration
         """
-        # Create a copy to avoid modifying original
-        modified_config = env_config.model_copy(deep=True)
+        settings = env_config.settings
 
         # Apply overrides
-        for key, value in overrides.items():
-            if hasattr(modified_config.settings, key):
-                setattr(modified_config.settings, key, value)
+        valid_fields = type(settings).model_fields
+        updates = {key: value for key, value in overrides.items() if key in valid_fields}
+
+        return self._update_settings(env_config, updates)
+
+    @staticmethod
+    def _update_settings(env_config: EnvironmentConfig, updates: Dict[str, Any]) -> EnvironmentConfig:
+        """Return a copy of the environment with validated settings updates applied.
+
+        Only the environment and its settings are copied; untouched sections are
+        shared with the original, and already-built submodels are not revalidated.
+
+        Args:
+            env_config: Base environment configuration
+            updates: Settings fields to replace
 
-        return modified_config
+        Returns:
+            Modified environment configuration
+        """
+        settings = env_config.settings
+        new_settings = type(settings).model_validate({**dict(settings), **updates})
+        return env_config.model_copy(update={"settings": new_settings})
 
     def get_available_environments(self) -> list[str]:
         """Get list of available environments."""
-        if not self._config:
-            self._load_raw_config()
-            self._validate_config()
+        if self._env_names is None:
+            if not self._config:
+                self._load_raw_config()
+                self._validate_config()
+            self._env_names = tuple(self._config.environments) if self._config else ()
+
+        return list(self._env_names)
+
+    def peek_environments(self) -> list[str]:
+        """Get environment names without building the configuration models.
+
+        Only the YAML node graph is composed and the keys of the top-level
+        ``environments`` mapping are read, so this is a cheap way to print hints
+        when the configuration has not been (or cannot be) validated.
+
+        Returns:
+            Environment names in file order
+        """
+        if self._env_names is not None:
+            return list(self._env_names)
+        if self._config:
+            return list(self._config.environments)
+        if self._raw_config:
+            return list(self._raw_config.get("environments") or {})
 
-        return list(self._config.environments.keys()) if self._config else []
+        if not self.config_file.exists():
+            self.config_file = _resolve_config(self.config_file.name, str(Path.cwd()))
+        root = yaml.compose(self.config_file.read_bytes(), Loader=_SafeLoader)
+        if not isinstance(root, yaml.MappingNode):
+            return []
+        for key, value in root.value:
+            if key.value == "environments" and isinstance(value, yaml.MappingNode):
+                return [env_key.value for env_key, _ in value.value]
+        return []
 
     def get_available_stack_types(self) -> list[str]:
         """Get list of available stack types."""
@@ -182,6 +492,12 @@ class ConfigLoader:
 
         return list(self._config.stacks.keys()) if self._config and self._config.stacks else []
 
+    @staticmethod
+    def clear_cache() -> None:
+        """Drop all parsed configuration files and resolved paths cached in this process."""
+        _YAML_CACHE.clear()
+        _resolve_config.cache_clear()
+
     def validate_config_file(self) -> bool:
         """Validate the configuration file without loading specific environment.
 
@@ -202,93 +518,8 @@ class ConfigLoader:
         Args:
             output_path: Path to write example configuration
         """
-        example_config = {
-            "global": {
-                "project_name": "n8n-deploy",
-                "organization": "mycompany",
-                "tags": {
-                    "Project": "n8n",
-                    "ManagedBy": "CDK",
-                    "Environment": "{{ environment }}",
-                },
-            },
-            "defaults": {
-                "fargate": {"cpu": 256, "memory": 512, "spot_percentage": 80},
-                "monitoring": {
-                    "log_retention_days": 30,
-                    "enable_container_insights": True,
-                },
-            },
-            "environments": {
-                "dev": {
-                    "account": "123456789012",
-                    "region": "us-east-1",
-                    "settings": {
-                        "fargate": {"cpu": 256, "memory": 512},
-                        "scaling": {"min_tasks": 1, "max_tasks": 1},
-                        "networking": {
-                            "use_existing_vpc": False,
-                            "vpc_cidr": "10.0.0.0/16",
-                        },
-                        "access": {
-                            "cloudfront_enabled": False,
-                            "api_gateway_throttle": 100,
-                        },
-                        "auth": {"basic_auth_enabled": True, "oauth_enabled": False},
-                    },
-                },
-                "production": {
-                    "account": "123456789013",
-                    "region": "us-west-2",
-                    "settings": {
-                        "fargate": {"cpu": 1024, "memory": 2048, "spot_percentage": 50},
-                        "scaling": {
-                            "min_tasks": 2,
-                            "max_tasks": 10,
-                            "target_cpu_utilization": 70,
-                        },
-                        "networking": {
-                            "use_existing_vpc": True,
-                            "vpc_id": "vpc-prod12345",
-                            "subnet_ids": ["subnet-1", "subnet-2"],
-                        },
-                        "access": {
-                            "domain_name": "n8n.example.com",
-                            "cloudfront_enabled": True,
-                            "waf_enabled": True,
-                            "api_gateway_throttle": 10000,
-                        },
-                        "database": {"type": "postgres", "use_existing": False},
-                        "auth": {
-                            "basic_auth_enabled": False,
-                            "oauth_enabled": True,
-                            "oauth_provider": "okta",
-                        },
-                    },
-                },
-            },
-            "stacks": {
-                "minimal": {
-                    "description": "Minimal setup for personal use",
-                    "components": ["fargate", "efs", "api_gateway"],
-                    "settings": {"fargate": {"cpu": 256, "memory": 512}},
-                },
-                "standard": {
-                    "description": "Standard setup with monitoring",
-                    "components": [
-                        "fargate",
-                        "efs",
-                        "api_gateway",
-                        "cloudfront",
-                        "monitoring",
-                    ],
-                    "inherit_from": "defaults",
-                },
-            },
-        }
-
         with open(output_path, "w") as f:
-            yaml.dump(example_config, f, default_flow_style=False, sort_keys=False)
+            yaml.dump(_EXAMPLE_CONFIG, f, Dumper=_SafeDumper, default_flow_style=False, sort_keys=False)
 
 
 # Helper function for CLI usage
@@ -2,9 +2,43 @@
 
 import re
 from enum import Enum
-from typing import Any, Dict, List, Optional
-
-from pydantic import BaseModel, Field, field_validator, model_validator, validator
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Union
+
+import yaml
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator, model_validator
+from typing_extensions import TypedDict
+
+from ._yaml import SafeLoader as _SafeLoader
+
+# A single RFC 1035 label: alphanumeric at both ends, hyphens allowed inside, at most 63 characters.
+# Domains are split on dots and each label is checked separately, which keeps validation linear
+# in the length of the input (a nested repeated group over the whole name can backtrack badly).
+_LABEL_RE = re.compile(r"^[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?\Z")
+_MAX_DOMAIN_LENGTH = 253
+
+# Valid Fargate task sizes as (cpu, memory) pairs, built once at import
+_FARGATE_MEMORY_BY_CPU = {
+    256: (512, 1024, 2048),
+    512: (1024, 2048, 3072, 4096),
+    1024: range(2048, 8193, 1024),
+    2048: range(4096, 16385, 1024),
+    4096: range(8192, 30721, 1024),
+    8192: range(16384, 61441, 4096),
+    16384: range(32768, 122881, 8192),
+}
+_VALID_CPUS = frozenset(_FARGATE_MEMORY_BY_CPU)
+_VALID_CPU_MEMORY = frozenset((cpu, memory) for cpu, memories in _FARGATE_MEMORY_BY_CPU.items() for memory in memories)
+
+# API Gateway CORS origins: "*" or scheme://host[:port], where the host may use a leading wildcard label
+_CORS_ORIGIN_RE = re.compile(r"^(?:\*|https?://(?:\*\.)?[A-Za-z0-9.-]+(?::[0-9]{1,5})?)\Z")
+# WAF IPv4 sets take addresses in CIDR notation
+_IPV4_OCTET = r"(?:25[0-5]|2[0-4][0-9]|1[0-9]{2}|[1-9]?[0-9])"
+_IPV4_CIDR_RE = re.compile(rf"^(?:{_IPV4_OCTET}\.){{3}}{_IPV4_OCTET}/(?:3[0-2]|[12]?[0-9])\Z")
+# Customer managed KMS key ARNs (key IDs only; aliases cannot be imported as keys)
+_KMS_KEY_ARN_RE = re.compile(r"^arn:aws[a-z-]*:kms:[a-z0-9-]+:[0-9]{12}:key/[A-Za-z0-9-]+\Z")
+# EFS throughput modes accepted under defaults.efs.throughput_mode
+_EFS_THROUGHPUT_MODES = frozenset({"elastic", "bursting", "provisioned"})
 
 
 class DatabaseType(str, Enum):
@@ -39,23 +73,12 @@ class FargateConfig(BaseModel):
     spot_percentage: int = Field(80, ge=0, le=100)
     n8n_version: str = Field("1.94.1", description="n8n Docker image version")
 
-    @validator("memory")
-    def validate_cpu_memory_combination(cls, memory, values):
+    @model_validator(mode="after")
+    def validate_cpu_memory_combination(self):
         """Validate Fargate CPU/memory combinations."""
-        cpu = values.get("cpu", 256)
-        valid_combinations = {
-            256: [512, 1024, 2048],
-            512: [1024, 2048, 3072, 4096],
-            1024: list(range(2048, 8193, 1024)),
-            2048: list(range(4096, 16385, 1024)),
-            4096: list(range(8192, 30721, 1024)),
-            8192: list(range(16384, 61441, 4096)),
-            16384: list(range(32768, 122881, 8192)),
-        }
-
-        if cpu in valid_combinations and memory not in valid_combinations[cpu]:
-            raise ValueError(f"Invalid CPU/memory combination: {cpu}/{memory}")
-        return memory
+        if self.cpu in _VALID_CPUS and (self.cpu, self.memory) not in _VALID_CPU_MEMORY:
+            raise ValueError(f"Invalid CPU/memory combination: {self.cpu}/{self.memory}")
+        return self
 
 
 class ScalingConfig(BaseModel):
@@ -67,13 +90,12 @@ class ScalingConfig(BaseModel):
     scale_in_cooldown: int = Field(300, ge=60)
     scale_out_cooldown: int = Field(60, ge=60)
 
-    @validator("max_tasks")
-    def validate_max_tasks(cls, max_tasks, values):
+    @model_validator(mode="after")
+    def validate_max_tasks(self):
         """Ensure max_tasks >= min_tasks."""
-        min_tasks = values.get("min_tasks", 1)
-        if max_tasks < min_tasks:
-            raise ValueError(f"max_tasks ({max_tasks}) must be >= min_tasks ({min_tasks})")
-        return max_tasks
+        if self.max_tasks < self.min_tasks:
+            raise ValueError(f"max_tasks ({self.max_tasks}) must be >= min_tasks ({self.min_tasks})")
+        return self
 
 
 class NetworkingConfig(BaseModel):
@@ -86,12 +108,12 @@ class NetworkingConfig(BaseModel):
     availability_zones: Optional[List[str]] = None
     nat_gateways: int = Field(0, ge=0, le=3)
 
-    @validator("vpc_id")
-    def validate_vpc_id(cls, vpc_id, values):
+    @model_validator(mode="after")
+    def validate_vpc_id(self):
         """Validate VPC ID when using existing VPC."""
-        if values.get("use_existing_vpc") and not vpc_id:
+        if self.use_existing_vpc and not self.vpc_id:
             raise ValueError("vpc_id required when use_existing_vpc is True")
-        return vpc_id
+        return self
 
 
 class DatabaseConfig(BaseModel):
@@ -135,19 +157,16 @@ class CloudflareConfig(BaseModel):
     @classmethod
     def validate_domain(cls, v):
         """Validate tunnel domain format."""
-        if v:
-            # More strict domain validation
-            # - Must start with alphanumeric
-            # - Can contain alphanumeric, hyphens, and dots
-            # - Cannot have consecutive dots
-            # - Cannot end with hyphen
-            # - Must have valid TLD
-            pattern = (
-                r"^[a-zA-Z0-9]([a-zA-Z0-9-_]*[a-zA-Z0-9])?"
-                r"(\.[a-zA-Z0-9]([a-zA-Z0-9-_]*[a-zA-Z0-9])?)*\.[a-zA-Z]{2,}$"
-            )
-            if not re.match(pattern, v):
-                raise ValueError(f"Invalid domain format: {v}. Must be a valid domain name.")
+        if not v:
+            return v
+        error = f"Invalid domain format: {v}. Must be a valid domain name."
+        # Cheap C-level checks reject over-long, non-ASCII and dotless input before any regex work
+        if len(v) > _MAX_DOMAIN_LENGTH or not v.isascii() or "." not in v:
+            raise ValueError(error)
+        labels = v.split(".")
+        tld = labels[-1]
+        if len(tld) < 2 or not tld.isalpha() or not all(_LABEL_RE.match(label) for label in labels):
+            raise ValueError(error)
         return v
 
 
@@ -163,10 +182,28 @@ class AccessConfig(BaseModel):
     ip_whitelist: Optional[List[str]] = None
     cloudflare: Optional[CloudflareConfig] = None
 
+    @field_validator("cors_origins")
+    @classmethod
+    def validate_cors_origins(cls, v):
+        """Validate CORS origins are "*" or scheme://host[:port]."""
+        invalid = [origin for origin in v if not _CORS_ORIGIN_RE.match(origin)]
+        if invalid:
+            raise ValueError(f"Invalid CORS origins: {invalid}. Expected '*' or scheme://host[:port].")
+        return v
+
+    @field_validator("ip_whitelist")
+    @classmethod
+    def validate_ip_whitelist(cls, v):
+        """Validate IP whitelist entries are IPv4 CIDR blocks."""
+        invalid = [cidr for cidr in v or () if not _IPV4_CIDR_RE.match(cidr)]
+        if invalid:
+            raise ValueError(f"Invalid IP whitelist entries: {invalid}. Expected IPv4 CIDR notation (e.g. 1.2.3.4/32).")
+        return v
+
     @model_validator(mode="after")
     def validate_cloudflare(self):
         """Validate Cloudflare config when type is CLOUDFLARE."""
-        if self.type == AccessType.CLOUDFLARE:
+        if self.type is AccessType.CLOUDFLARE:
             if not self.cloudflare:
                 # Create a default cloudflare config without full validation
                 # The actual validation will happen when the config is used
@@ -185,12 +222,12 @@ class AuthConfig(BaseModel):
     mfa_required: bool = False
     allowed_email_domains: Optional[List[str]] = None
 
-    @validator("oauth_provider")
-    def validate_oauth_provider(cls, oauth_provider, values):
+    @model_validator(mode="after")
+    def validate_oauth_provider(self):
         """Validate OAuth provider when OAuth is enabled."""
-        if values.get("oauth_enabled") and not oauth_provider:
+        if self.oauth_enabled and not self.oauth_provider:
             raise ValueError("oauth_provider required when oauth_enabled is True")
-        return oauth_provider
+        return self
 
 
 class MonitoringConfig(BaseModel):
@@ -210,6 +247,15 @@ class BackupConfig(BaseModel):
     retention_days: int = Field(7, ge=1, le=365)
     cross_region_backup: bool = False
     backup_regions: Optional[List[str]] = None
+    kms_key_arn: Optional[str] = None
+
+    @field_validator("kms_key_arn")
+    @classmethod
+    def validate_kms_key_arn(cls, v):
+        """Validate the backup vault key is a KMS key ARN."""
+        if v and not _KMS_KEY_ARN_RE.match(v):
+            raise ValueError(f"Invalid kms_key_arn: {v}. Expected arn:aws:kms:<region>:<account>:key/<key-id>.")
+        return v
 
 
 class HighAvailabilityConfig(BaseModel):
@@ -230,6 +276,21 @@ class DockerConfig(BaseModel):
     profiles: Optional[List[str]] = None
 
 
+class FeaturesConfig(TypedDict, total=False):
+    """Feature flags for an environment.
+
+    Validated as a plain dict so stacks keep using ``features.get(...)``; the
+    known keys are typed and any other flags pass through unchanged.
+    """
+
+    __pydantic_config__ = ConfigDict(extra="allow")  # type: ignore[misc]
+
+    components: List[str]
+    webhooks_enabled: bool
+    email_enabled: bool
+    resilience_enabled: bool
+
+
 class EnvironmentSettings(BaseModel):
     """Environment-specific settings."""
 
@@ -244,7 +305,7 @@ class EnvironmentSettings(BaseModel):
     monitoring: Optional[MonitoringConfig] = None
     backup: Optional[BackupConfig] = None
     high_availability: Optional[HighAvailabilityConfig] = None
-    features: Optional[Dict[str, Any]] = None
+    features: Optional[FeaturesConfig] = None
 
 
 class MultiRegionConfig(BaseModel):
@@ -298,6 +359,25 @@ class DefaultsConfig(BaseModel):
     monitoring: Optional[MonitoringConfig] = None
     backup: Optional[BackupConfig] = None
 
+    @field_validator("efs")
+    @classmethod
+    def validate_efs(cls, v):
+        """Validate the EFS throughput mode, its provisioned throughput and root mounts."""
+        if not v:
+            return v
+        # The root is owned by root (755) and does not hold the access point's /n8n-data tree
+        if not v.get("use_access_point", True) and not v.get("root_owned_by_n8n", False):
+            raise ValueError(
+                "use_access_point: false mounts the EFS root, which uid 1000 cannot write. Prepare the root as "
+                "described in docs/cost-optimization.md (Mounting the EFS Root) and set root_owned_by_n8n: true."
+            )
+        mode = v.get("throughput_mode", "elastic")
+        if mode not in _EFS_THROUGHPUT_MODES:
+            raise ValueError(f"Invalid EFS throughput_mode: {mode}. Expected one of {sorted(_EFS_THROUGHPUT_MODES)}.")
+        if mode == "provisioned" and not v.get("provisioned_throughput_mibps"):
+            raise ValueError("provisioned_throughput_mibps is required when EFS throughput_mode is provisioned")
+        return v
+
 
 class N8nConfig(BaseModel):
     """Root configuration model."""
@@ -311,6 +391,33 @@ class N8nConfig(BaseModel):
     class Config:
         populate_by_name = True
 
+    @classmethod
+    def load(cls, data: Union[Mapping[str, Any], bytes, str]) -> "N8nConfig":
+        """Validate a root configuration through the shared type adapter.
+
+        Args:
+            data: Parsed configuration mapping, or a JSON document as bytes/str
+
+        Returns:
+            Validated configuration
+        """
+        if isinstance(data, (bytes, str)):
+            return _N8N_ADAPTER.validate_json(data)
+        return _N8N_ADAPTER.validate_python(data)
+
+    @classmethod
+    def from_yaml(cls, path: Union[str, Path]) -> "N8nConfig":
+        """Parse and validate a configuration file.
+
+        Args:
+            path: Path to the YAML configuration file
+
+        Returns:
+            Validated configuration
+        """
+        with open(path, "rb") as f:
+            return cls.load(yaml.load(f, Loader=_SafeLoader))
+
     def get_environment(self, env_name: str) -> Optional[EnvironmentConfig]:
         """Get configuration for a specific environment."""
         return self.environments.get(env_name)
@@ -324,17 +431,18 @@ class N8nConfig(BaseModel):
         if not self.defaults:
             return env_config
 
-        # Deep merge logic here
-        merged = env_config.copy(deep=True)
+        # Only the sections that fall back to a default are replaced; untouched
+        # sections are shared with the original config rather than copied
+        settings = env_config.settings
+        updates: Dict[str, Any] = {}
+        for section in ("fargate", "monitoring", "backup"):
+            default = getattr(self.defaults, section)
+            if default and not getattr(settings, section):
+                updates[section] = default
 
-        # Merge each configuration section with defaults
-        if self.defaults.fargate and not merged.settings.fargate:
-            merged.settings.fargate = self.defaults.fargate
-
-        if self.defaults.monitoring and not merged.settings.monitoring:
-            merged.settings.monitoring = self.defaults.monitoring
+        if not updates:
+            return env_config
+        return env_config.model_copy(update={"settings": settings.model_copy(update=updates)})
 
-        if self.defaults.backup and not merged.settings.backup:
-            merged.settings.backup = self.defaults.backup
 
-        return merged
+_N8N_ADAPTER = TypeAdapter(N8nConfig)
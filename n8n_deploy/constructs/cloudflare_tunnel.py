@@ -1,18 +1,36 @@
 """Cloudflare Tunnel construct for zero-trust access to n8n."""
 
-from typing import Any, Dict, Optional
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
 
-from aws_cdk import Duration, Stack
+from aws_cdk import CfnOutput, Duration, Stack
 from aws_cdk import aws_ecs as ecs
 from aws_cdk import aws_iam as iam
 from aws_cdk import aws_logs as logs
 from aws_cdk import aws_secretsmanager as secretsmanager
 from constructs import Construct
 
+# Shared read-only stand-in for an unset access configuration
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
 
 class CloudflareTunnelConfiguration(Construct):
     """Configuration for Cloudflare Tunnel including secrets and access policies."""
 
+    # Origin request settings shared by every tunnel; per-tunnel host fields are added on top
+    _ORIGIN_REQUEST_DEFAULTS = MappingProxyType(
+        {
+            "noTLSVerify": True,  # Since we're connecting to localhost
+            "connectTimeout": "30s",
+            "tcpKeepAlive": "30s",
+            "keepAliveConnections": 100,
+            "keepAliveTimeout": "90s",
+        }
+    )
+
+    # Catch-all rule closing every ingress list; each config gets its own copy so it stays serializable
+    _CATCH_ALL = MappingProxyType({"service": "http_status:404"})
+
     def __init__(
         self,
         scope: Construct,
@@ -44,7 +62,7 @@ class CloudflareTunnelConfiguration(Construct):
         self.tunnel_domain = tunnel_domain
         self.service_url = service_url
         self.environment = environment
-        self.access_config = access_config or {}
+        self.access_config: Mapping[str, Any] = access_config if access_config is not None else _EMPTY
 
         # Create or reference the tunnel token secret
         if tunnel_secret_name:
@@ -62,8 +80,6 @@ class CloudflareTunnelConfiguration(Construct):
             )
 
             # Add output for manual token configuration
-            from aws_cdk import CfnOutput
-
             stack = Stack.of(self)
             CfnOutput(
                 stack,
@@ -83,17 +99,12 @@ class CloudflareTunnelConfiguration(Construct):
                     "hostname": tunnel_domain,
                     "service": service_url,
                     "originRequest": {
-                        "noTLSVerify": True,  # Since we're connecting to localhost
-                        "connectTimeout": "30s",
-                        "tcpKeepAlive": "30s",
-                        "keepAliveConnections": 100,
-                        "keepAliveTimeout": "90s",
+                        **self._ORIGIN_REQUEST_DEFAULTS,
                         "httpHostHeader": tunnel_domain,
                         "originServerName": tunnel_domain,
                     },
                 },
-                # Catch-all rule
-                {"service": "http_status:404"},
+                dict(self._CATCH_ALL),
             ],
         }
 
@@ -103,21 +114,18 @@ class CloudflareTunnelConfiguration(Construct):
 
     def _add_access_policies(self) -> None:
         """Add Cloudflare Access policies to the tunnel configuration."""
-        access_rules = []
-
-        # Email-based access
-        if self.access_config.get("allowed_emails"):
-            for email in self.access_config["allowed_emails"]:
-                access_rules.append({"type": "email", "email": {"email": email}})
-
-        # Domain-based access
-        if self.access_config.get("allowed_domains"):
-            for domain in self.access_config["allowed_domains"]:
-                access_rules.append({"type": "email_domain", "email_domain": {"domain": domain}})
+        # Email-based access followed by domain-based access
+        access_rules = [
+            {"type": "email", "email": {"email": email}} for email in self.access_config.get("allowed_emails") or ()
+        ] + [
+            {"type": "email_domain", "email_domain": {"domain": domain}}
+            for domain in self.access_config.get("allowed_domains") or ()
+        ]
 
         # Add access configuration to the tunnel
         if access_rules:
-            self.tunnel_config["ingress"][0]["originRequest"]["access"] = {
+            origin_request = self.tunnel_config["ingress"][0]["originRequest"]
+            origin_request["access"] = {
                 "required": True,
                 "teamName": self.environment,
                 "policies": access_rules,
@@ -1,5 +1,6 @@
 """Construct for n8n Fargate service with all required configurations."""
 
+from functools import cached_property
 from typing import Dict, List, Optional
 
 from aws_cdk import Duration, RemovalPolicy, Stack
@@ -12,12 +13,83 @@ from aws_cdk import aws_secretsmanager as secretsmanager
 from aws_cdk import aws_servicediscovery as servicediscovery
 from constructs import Construct
 
+from .._utils import nearest
 from ..config.models import DatabaseType, EnvironmentConfig, FargateConfig
 
+# CloudWatch Logs retention periods as (days, RetentionDays) pairs, sorted by days
+_RETENTION_TABLE = (
+    (1, logs.RetentionDays.ONE_DAY),
+    (3, logs.RetentionDays.THREE_DAYS),
+    (5, logs.RetentionDays.FIVE_DAYS),
+    (7, logs.RetentionDays.ONE_WEEK),
+    (14, logs.RetentionDays.TWO_WEEKS),
+    (30, logs.RetentionDays.ONE_MONTH),
+    (60, logs.RetentionDays.TWO_MONTHS),
+    (90, logs.RetentionDays.THREE_MONTHS),
+    (120, logs.RetentionDays.FOUR_MONTHS),
+    (150, logs.RetentionDays.FIVE_MONTHS),
+    (180, logs.RetentionDays.SIX_MONTHS),
+    (365, logs.RetentionDays.ONE_YEAR),
+    (400, logs.RetentionDays.THIRTEEN_MONTHS),
+    (545, logs.RetentionDays.EIGHTEEN_MONTHS),
+    (731, logs.RetentionDays.TWO_YEARS),
+    (1096, logs.RetentionDays.THREE_YEARS),
+    (1827, logs.RetentionDays.FIVE_YEARS),
+)
+_RETENTION_DAYS = tuple(days for days, _ in _RETENTION_TABLE)
+_RETENTION_BY_DAYS = dict(_RETENTION_TABLE)
+
+# Characters left out of generated secrets so they survive env vars, URLs and shells unquoted
+_SECRET_EXCLUDE_CHARS = " %+~`#$&*()|[]{}:;<>?!'/@\"\\"
+
+# Container environment shared by every n8n service; per-environment values are added on top
+_BASE_ENV_VARS: Dict[str, str] = {
+    # Basic configuration
+    "N8N_HOST": "0.0.0.0",  # nosec B104 - Required for container networking
+    "N8N_PORT": "5678",
+    "N8N_PROTOCOL": "https",
+    "NODE_ENV": "production",
+    # Paths
+    "N8N_USER_FOLDER": "/home/node/.n8n",
+    # Security
+    "N8N_SECURE_COOKIE": "true",
+    # Execution settings
+    "EXECUTIONS_MODE": "regular",
+    "EXECUTIONS_PROCESS": "main",
+    # Timezone
+    "TZ": "UTC",
+    "GENERIC_TIMEZONE": "UTC",
+    # Metrics
+    "N8N_METRICS": "true",
+    "N8N_METRICS_PREFIX": "n8n_",
+    # Database (SQLite unless a Postgres endpoint is available)
+    "DB_TYPE": "sqlite",
+    "DB_SQLITE_DATABASE": "/home/node/.n8n/database.sqlite",
+}
+
+# n8n listens on 5678; the health check probes its /healthz endpoint
+_N8N_PORT_MAPPING = ecs.PortMapping(container_port=5678, protocol=ecs.Protocol.TCP)
+_HEALTH_CHECK_COMMAND = ("CMD-SHELL", "wget --no-verbose --tries=1 --spider http://localhost:5678/healthz || exit 1")
+
+
+def _closest_retention(days: int) -> logs.RetentionDays:
+    """Find the CloudWatch Logs retention period closest to a number of days.
+
+    Args:
+        days: Requested retention in days
+
+    Returns:
+        Closest supported retention period; ties resolve to the shorter one
+    """
+    return _RETENTION_BY_DAYS[nearest(_RETENTION_DAYS, days)]
+
 
 class N8nFargateService(Construct):
     """Construct for n8n Fargate service."""
 
+    # Shared fallback for environments without a fargate section; never mutated
+    _DEFAULT_FARGATE = FargateConfig()
+
     def __init__(
         self,
         scope: Construct,
@@ -27,10 +99,11 @@ class N8nFargateService(Construct):
         subnets: List[ec2.ISubnet],
         security_group: ec2.SecurityGroup,
         file_system: efs.FileSystem,
-        access_point: efs.AccessPoint,
+        access_point: Optional[efs.AccessPoint],
         env_config: EnvironmentConfig,
         environment: str,
-        database_endpoint: Optional[str] = None,
+        database_host: Optional[str] = None,
+        database_port: Optional[str] = None,
         database_secret: Optional[secretsmanager.ISecret] = None,
         **kwargs,
     ) -> None:
@@ -44,10 +117,11 @@ class N8nFargateService(Construct):
             subnets: Subnets for the service
             security_group: Security group for the service
             file_system: EFS file system
-            access_point: EFS access point
+            access_point: EFS access point, or None to mount the file system root
             env_config: Environment configuration
             environment: Environment name
-            database_endpoint: Optional RDS endpoint
+            database_host: Optional database hostname
+            database_port: Optional database port (defaults to 5432 when a host is given)
             database_secret: Optional database credentials secret
             **kwargs: Additional properties
         """
@@ -62,9 +136,14 @@ class N8nFargateService(Construct):
         self.env_config = env_config
         self.environment = environment
 
+        # Name prefixes shared by the resources this construct creates
+        self._name_prefix = f"n8n-{environment}"  # task family, service, S3 buckets
+        self._path_prefix = f"n8n/{environment}"  # secrets, SSM parameters, log group
+
         # Get configurations
-        self.fargate_config = env_config.settings.fargate or FargateConfig()
+        self.fargate_config = env_config.settings.fargate or self._DEFAULT_FARGATE
         self.database_config = env_config.settings.database
+        self._memory_soft = self.fargate_config.memory * 4 // 5  # 80% soft limit for the container
 
         # Create log group
         self.log_group = self._create_log_group()
@@ -73,7 +152,7 @@ class N8nFargateService(Construct):
         self.task_definition = self._create_task_definition()
 
         # Add container
-        self.container = self._add_n8n_container(database_endpoint, database_secret)
+        self.container = self._add_n8n_container(database_host, database_port, database_secret)
 
         # Create service
         self.service = self._create_fargate_service()
@@ -83,38 +162,15 @@ class N8nFargateService(Construct):
 
     def _create_log_group(self) -> logs.LogGroup:
         """Create CloudWatch log group for n8n."""
-        # Map numeric days to RetentionDays enum
-        retention_map = {
-            1: logs.RetentionDays.ONE_DAY,
-            3: logs.RetentionDays.THREE_DAYS,
-            5: logs.RetentionDays.FIVE_DAYS,
-            7: logs.RetentionDays.ONE_WEEK,
-            14: logs.RetentionDays.TWO_WEEKS,
-            30: logs.RetentionDays.ONE_MONTH,
-            60: logs.RetentionDays.TWO_MONTHS,
-            90: logs.RetentionDays.THREE_MONTHS,
-            120: logs.RetentionDays.FOUR_MONTHS,
-            150: logs.RetentionDays.FIVE_MONTHS,
-            180: logs.RetentionDays.SIX_MONTHS,
-            365: logs.RetentionDays.ONE_YEAR,
-            400: logs.RetentionDays.THIRTEEN_MONTHS,
-            545: logs.RetentionDays.EIGHTEEN_MONTHS,
-            731: logs.RetentionDays.TWO_YEARS,
-            1096: logs.RetentionDays.THREE_YEARS,
-            1827: logs.RetentionDays.FIVE_YEARS,
-        }
-
         retention_days = logs.RetentionDays.ONE_MONTH  # Default
         if self.env_config.settings.monitoring and self.env_config.settings.monitoring.log_retention_days:
-            requested_days = self.env_config.settings.monitoring.log_retention_days
             # Find the closest matching retention period
-            closest_days = min(retention_map.keys(), key=lambda x: abs(x - requested_days))
-            retention_days = retention_map[closest_days]
+            retention_days = _closest_retention(self.env_config.settings.monitoring.log_retention_days)
 
         return logs.LogGroup(
             self,
             "LogGroup",
-            log_group_name=f"/ecs/n8n/{self.environment}",
+            log_group_name=f"/ecs/{self._path_prefix}",
             retention=retention_days,
             removal_policy=RemovalPolicy.DESTROY if self.environment == "dev" else RemovalPolicy.RETAIN,
         )
@@ -126,7 +182,7 @@ class N8nFargateService(Construct):
             "TaskDefinition",
             cpu=self.fargate_config.cpu,
             memory_limit_mib=self.fargate_config.memory,
-            family=f"n8n-{self.environment}",
+            family=self._name_prefix,
         )
 
         # Add EFS volume
@@ -136,7 +192,7 @@ class N8nFargateService(Construct):
                 file_system_id=self.file_system.file_system_id,
                 transit_encryption="ENABLED",
                 authorization_config=ecs.AuthorizationConfig(
-                    access_point_id=self.access_point.access_point_id, iam="ENABLED"
+                    access_point_id=self.access_point.access_point_id if self.access_point else None, iam="ENABLED"
                 ),
             ),
         )
@@ -151,18 +207,16 @@ class N8nFargateService(Construct):
 
     def _add_n8n_container(
         self,
-        database_endpoint: Optional[str],
+        database_host: Optional[str],
+        database_port: Optional[str],
         database_secret: Optional[secretsmanager.ISecret],
     ) -> ecs.ContainerDefinition:
         """Add n8n container to task definition."""
-        # Get or create encryption key secret
-        encryption_key = self._get_or_create_encryption_key()
-
         # Build environment variables
-        environment = self._build_environment_variables(database_endpoint)
+        environment = self._build_environment_variables(database_host, database_port)
 
         # Build secrets
-        secrets = self._build_secrets(encryption_key, database_secret)
+        secrets = self._build_secrets(database_secret)
 
         # Get n8n version from config, default to 1.94.1
         n8n_version = "1.94.1"
@@ -179,23 +233,15 @@ class N8nFargateService(Construct):
             ),
             environment=environment,
             secrets=secrets,
-            port_mappings=[
-                ecs.PortMapping(
-                    container_port=5678,
-                    protocol=ecs.Protocol.TCP,
-                )
-            ],
+            port_mappings=[_N8N_PORT_MAPPING],
             health_check=ecs.HealthCheck(
-                command=[
-                    "CMD-SHELL",
-                    "wget --no-verbose --tries=1 --spider http://localhost:5678/healthz || exit 1",
-                ],
+                command=list(_HEALTH_CHECK_COMMAND),
                 interval=Duration.seconds(30),
                 timeout=Duration.seconds(5),
                 retries=3,
                 start_period=Duration.seconds(60),
             ),
-            memory_reservation_mib=int(self.fargate_config.memory * 0.8),  # 80% soft limit
+            memory_reservation_mib=self._memory_soft,
         )
 
         # Mount EFS volume
@@ -209,104 +255,75 @@ class N8nFargateService(Construct):
 
         return container
 
-    def _build_environment_variables(self, database_endpoint: Optional[str]) -> Dict[str, str]:
+    def _build_environment_variables(
+        self, database_host: Optional[str], database_port: Optional[str]
+    ) -> Dict[str, str]:
         """Build environment variables for n8n container."""
-        env_vars = {
-            # Basic configuration
-            "N8N_HOST": "0.0.0.0",  # nosec B104 - Required for container networking
-            "N8N_PORT": "5678",
-            "N8N_PROTOCOL": "https",
-            "NODE_ENV": "production",
-            # Paths
-            "N8N_USER_FOLDER": "/home/node/.n8n",
-            # Security
-            "N8N_SECURE_COOKIE": "true",
-            # Execution settings
-            "EXECUTIONS_MODE": "regular",
-            "EXECUTIONS_PROCESS": "main",
-            # Timezone
-            "TZ": "UTC",
-            "GENERIC_TIMEZONE": "UTC",
-        }
+        settings = self.env_config.settings
+        auth = settings.auth
+        features = settings.features
+        access = settings.access
+
+        env_vars = dict(_BASE_ENV_VARS)
 
         # Database configuration
-        if self.database_config and self.database_config.type == DatabaseType.POSTGRES and database_endpoint:
+        if self.database_config and self.database_config.type == DatabaseType.POSTGRES and database_host:
+            del env_vars["DB_SQLITE_DATABASE"]
             env_vars.update(
                 {
                     "DB_TYPE": "postgresdb",
-                    "DB_POSTGRESDB_HOST": database_endpoint.split(":")[0],
-                    "DB_POSTGRESDB_PORT": database_endpoint.split(":")[1] if ":" in database_endpoint else "5432",
+                    "DB_POSTGRESDB_HOST": database_host,
+                    "DB_POSTGRESDB_PORT": database_port or "5432",
                     "DB_POSTGRESDB_DATABASE": "n8n",
                     "DB_POSTGRESDB_SCHEMA": "public",
                 }
             )
-        else:
-            env_vars.update(
-                {
-                    "DB_TYPE": "sqlite",
-                    "DB_SQLITE_DATABASE": "/home/node/.n8n/database.sqlite",
-                }
-            )
 
         # Auth configuration
-        if self.env_config.settings.auth:
-            if self.env_config.settings.auth.basic_auth_enabled:
-                env_vars["N8N_BASIC_AUTH_ACTIVE"] = "true"
+        if auth and auth.basic_auth_enabled:
+            env_vars["N8N_BASIC_AUTH_ACTIVE"] = "true"
 
         # Webhook configuration
-        if self.env_config.settings.features and self.env_config.settings.features.get("webhooks_enabled"):
-            env_vars["WEBHOOK_URL"] = (
-                f"https://{self.env_config.settings.access.domain_name}/webhook"
-                if self.env_config.settings.access and self.env_config.settings.access.domain_name
-                else ""
-            )
-
-        # Metrics
-        env_vars["N8N_METRICS"] = "true"
-        env_vars["N8N_METRICS_PREFIX"] = "n8n_"
+        if features and features.get("webhooks_enabled"):
+            env_vars["WEBHOOK_URL"] = f"https://{access.domain_name}/webhook" if access and access.domain_name else ""
 
         return env_vars
 
     def _build_secrets(
         self,
-        encryption_key: secretsmanager.ISecret,
         database_secret: Optional[secretsmanager.ISecret],
     ) -> Dict[str, ecs.Secret]:
         """Build secrets for n8n container."""
-        secrets = {
-            "N8N_ENCRYPTION_KEY": ecs.Secret.from_secrets_manager(encryption_key),
-        }
+        items = [("N8N_ENCRYPTION_KEY", ecs.Secret.from_secrets_manager(self.encryption_key))]
 
         # Database credentials
         if database_secret and self.database_config and self.database_config.type == DatabaseType.POSTGRES:
-            secrets.update(
-                {
-                    "DB_POSTGRESDB_USER": ecs.Secret.from_secrets_manager(database_secret, "username"),
-                    "DB_POSTGRESDB_PASSWORD": ecs.Secret.from_secrets_manager(database_secret, "password"),
-                }
-            )
+            items += [
+                ("DB_POSTGRESDB_USER", ecs.Secret.from_secrets_manager(database_secret, "username")),
+                ("DB_POSTGRESDB_PASSWORD", ecs.Secret.from_secrets_manager(database_secret, "password")),
+            ]
 
         # Basic auth credentials
-        if self.env_config.settings.auth and self.env_config.settings.auth.basic_auth_enabled:
+        auth = self.env_config.settings.auth
+        if auth and auth.basic_auth_enabled:
             basic_auth_secret = self._get_or_create_basic_auth_secret()
-            secrets.update(
-                {
-                    "N8N_BASIC_AUTH_USER": ecs.Secret.from_secrets_manager(basic_auth_secret, "username"),
-                    "N8N_BASIC_AUTH_PASSWORD": ecs.Secret.from_secrets_manager(basic_auth_secret, "password"),
-                }
-            )
+            items += [
+                ("N8N_BASIC_AUTH_USER", ecs.Secret.from_secrets_manager(basic_auth_secret, "username")),
+                ("N8N_BASIC_AUTH_PASSWORD", ecs.Secret.from_secrets_manager(basic_auth_secret, "password")),
+            ]
 
-        return secrets
+        return dict(items)
 
-    def _get_or_create_encryption_key(self) -> secretsmanager.ISecret:
-        """Get or create n8n encryption key secret."""
+    @cached_property
+    def encryption_key(self) -> secretsmanager.ISecret:
+        """n8n encryption key secret, created on first access."""
         return secretsmanager.Secret(
             self,
             "EncryptionKey",
-            secret_name=f"n8n/{self.environment}/encryption-key",
+            secret_name=f"{self._path_prefix}/encryption-key",
             description=f"n8n encryption key for {self.environment}",
             generate_secret_string=secretsmanager.SecretStringGenerator(
-                exclude_characters=" %+~`#$&*()|[]{}:;<>?!'/@\"\\",
+                exclude_characters=_SECRET_EXCLUDE_CHARS,
                 password_length=32,
             ),
         )
@@ -316,12 +333,12 @@ class N8nFargateService(Construct):
         return secretsmanager.Secret(
             self,
             "BasicAuthSecret",
-            secret_name=f"n8n/{self.environment}/basic-auth",
+            secret_name=f"{self._path_prefix}/basic-auth",
             description=f"n8n basic auth credentials for {self.environment}",
             generate_secret_string=secretsmanager.SecretStringGenerator(
                 secret_string_template='{"username": "admin"}',
                 generate_string_key="password",
-                exclude_characters=" %+~`#$&*()|[]{}:;<>?!'/@\"\\",
+                exclude_characters=_SECRET_EXCLUDE_CHARS,
                 password_length=20,
             ),
         )
@@ -363,7 +380,7 @@ class N8nFargateService(Construct):
             "Service",
             cluster=self.cluster,
             task_definition=self.task_definition,
-            service_name=f"n8n-{self.environment}",
+            service_name=self._name_prefix,
             vpc_subnets=ec2.SubnetSelection(subnets=self.subnets),
             security_groups=[self.security_group],
             desired_count=self.env_config.settings.scaling.min_tasks if self.env_config.settings.scaling else 1,
@@ -377,17 +394,8 @@ class N8nFargateService(Construct):
 
     def _setup_service_discovery(self) -> None:
         """Set up service discovery for internal communication."""
-        # Check if namespace already exists on the cluster
-        namespace = None
-        if hasattr(self.cluster, "default_cloud_map_namespace"):
-            namespace = self.cluster.default_cloud_map_namespace
-        else:
-            # Create new namespace
-            namespace = self.cluster.add_default_cloud_map_namespace(
-                name=f"n8n-{self.environment}.local",
-                type=servicediscovery.NamespaceType.DNS_PRIVATE,
-                vpc=self.vpc,
-            )
+        # Read the namespace in one jsii call; the property is None when the cluster has none
+        namespace = getattr(self.cluster, "default_cloud_map_namespace", None)
 
         # Associate service with service discovery if namespace exists
         if namespace:
@@ -399,8 +407,8 @@ class N8nFargateService(Construct):
 
     def _add_n8n_permissions(self, role: iam.IRole) -> None:
         """Add required IAM permissions for n8n."""
-        # S3 permissions for workflow storage/import/export
-        role.add_to_policy(
+        statements = [
+            # S3 permissions for workflow storage/import/export
             iam.PolicyStatement(
                 effect=iam.Effect.ALLOW,
                 actions=[
@@ -410,15 +418,16 @@ class N8nFargateService(Construct):
                     "s3:ListBucket",
                 ],
                 resources=[
-                    f"arn:aws:s3:::n8n-{self.environment}-*/*",
-                    f"arn:aws:s3:::n8n-{self.environment}-*",
+                    f"arn:aws:s3:::{self._name_prefix}-*/*",
+                    f"arn:aws:s3:::{self._name_prefix}-*",
                 ],
             )
-        )
+        ]
 
         # SES permissions for email sending (if needed)
-        if self.env_config.settings.features and self.env_config.settings.features.get("email_enabled"):
-            role.add_to_policy(
+        features = self.env_config.settings.features
+        if features and features.get("email_enabled"):
+            statements.append(
                 iam.PolicyStatement(
                     effect=iam.Effect.ALLOW,
                     actions=[
@@ -430,7 +439,8 @@ class N8nFargateService(Construct):
             )
 
         # SSM Parameter Store (for dynamic configuration)
-        role.add_to_policy(
+        stack = Stack.of(self)
+        statements.append(
             iam.PolicyStatement(
                 effect=iam.Effect.ALLOW,
                 actions=[
@@ -438,7 +448,10 @@ class N8nFargateService(Construct):
                     "ssm:GetParameters",
                 ],
                 resources=[
-                    f"arn:aws:ssm:{Stack.of(self).region}:{Stack.of(self).account}:parameter/n8n/{self.environment}/*",
+                    f"arn:aws:ssm:{stack.region}:{stack.account}:parameter/{self._path_prefix}/*",
                 ],
             )
         )
+
+        # Attach the application permissions as one policy, separate from CDK-managed grants
+        iam.Policy(self, "N8nPermissions", statements=statements).attach_to_role(role)
@@ -1,18 +1,65 @@
 """Resilient n8n construct with error recovery mechanisms."""
 
+from pathlib import Path
 from typing import Any, Dict
 
-from aws_cdk import Duration, RemovalPolicy
+from aws_cdk import AssetHashType, BundlingOptions, DockerVolume, Duration, RemovalPolicy
 from aws_cdk import aws_cloudwatch as cloudwatch
 from aws_cdk import aws_cloudwatch_actions as cloudwatch_actions
+from aws_cdk import aws_ec2 as ec2
 from aws_cdk import aws_events as events
 from aws_cdk import aws_events_targets as events_targets
 from aws_cdk import aws_iam as iam
 from aws_cdk import aws_lambda as lambda_
+from aws_cdk import aws_lambda_event_sources as lambda_event_sources
 from aws_cdk import aws_sns as sns
 from aws_cdk import aws_sqs as sqs
+from aws_cdk import aws_stepfunctions as sfn
+from aws_cdk import aws_stepfunctions_tasks as sfn_tasks
 from constructs import Construct
 
+# Shared by the resilience functions. 3.12+ starts faster and is required for SnapStart.
+_LAMBDA_RUNTIME = lambda_.Runtime.PYTHON_3_13
+
+# Alias that callers invoke; SnapStart only applies to published versions, never $LATEST.
+_LIVE_ALIAS = "live"
+
+_HANDLERS_DIR = Path(__file__).resolve().parent.parent / "lambdas"
+
+# Modules under lambdas/shared are copied next to every handler's index.py
+_SHARED_DIR = _HANDLERS_DIR / "shared"
+
+# Compile with the runtime's own interpreter so the bytecode matches; unchecked-hash pycs are
+# loaded without comparing against the source, which keeps tracebacks readable.
+_PRECOMPILE_BUNDLING = BundlingOptions(
+    image=_LAMBDA_RUNTIME.bundling_image,
+    command=[
+        "bash",
+        "-c",
+        "cp -r /asset-input/. /asset-output && cp /asset-shared/*.py /asset-output && "
+        "python -m compileall -q --invalidation-mode unchecked-hash /asset-output",
+    ],
+    volumes=[DockerVolume(host_path=str(_SHARED_DIR), container_path="/asset-shared")],
+)
+
+
+def _handler_code(name: str) -> lambda_.Code:
+    """Get the precompiled asset for a handler under ``n8n_deploy/lambdas``.
+
+    Args:
+        name: Handler directory name
+
+    Returns:
+        Lambda code asset
+    """
+    return lambda_.Code.from_asset(
+        str(_HANDLERS_DIR / name),
+        bundling=_PRECOMPILE_BUNDLING,
+        exclude=["__pycache__"],
+        # The source hash only covers the handler directory; hash the output so shared module changes redeploy
+        asset_hash_type=AssetHashType.OUTPUT,
+    )
+
 
 class ResilientN8n(Construct):
     """Construct for adding resilience patterns to n8n deployment."""
@@ -24,6 +71,8 @@ class ResilientN8n(Construct):
         compute_stack: Any,
         monitoring_topic: sns.Topic,
         environment: str,
+        retry_concurrency: int = 10,
+        container_insights: bool = False,
         **kwargs,
     ) -> None:
         """Initialize resilient n8n construct.
@@ -34,6 +83,8 @@ class ResilientN8n(Construct):
             compute_stack: Compute stack with n8n service
             monitoring_topic: SNS topic for alerts
             environment: Environment name
+            retry_concurrency: Maximum concurrent retry handler invocations driven by the retry queue (2-1000)
+            container_insights: Whether the cluster publishes Container Insights metrics
             **kwargs: Additional properties
         """
         super().__init__(scope, construct_id, **kwargs)
@@ -41,6 +92,8 @@ class ResilientN8n(Construct):
         self.compute_stack = compute_stack
         self.monitoring_topic = monitoring_topic
         self.environment = environment
+        self.retry_concurrency = retry_concurrency
+        self.container_insights = container_insights
 
         # Create dead letter queues
         self.webhook_dlq = self._create_webhook_dlq()
@@ -65,7 +118,7 @@ class ResilientN8n(Construct):
             "WebhookDLQ",
             queue_name=f"n8n-{self.environment}-webhook-dlq",
             retention_period=Duration.days(14),
-            encryption=sqs.QueueEncryption.KMS_MANAGED,
+            encryption=sqs.QueueEncryption.SQS_MANAGED,
             visibility_timeout=Duration.minutes(5),
         )
 
@@ -75,9 +128,10 @@ class ResilientN8n(Construct):
             "WebhookDLQAlarm",
             alarm_name=f"n8n-{self.environment}-webhook-dlq-messages",
             alarm_description="Messages in webhook dead letter queue",
-            metric=dlq.metric_approximate_number_of_messages_visible(),
+            metric=dlq.metric_approximate_number_of_messages_visible(period=Duration.minutes(1)),
             threshold=5,
-            evaluation_periods=1,
+            evaluation_periods=3,
+            datapoints_to_alarm=2,
             treat_missing_data=cloudwatch.TreatMissingData.NOT_BREACHING,
         )
         dlq_alarm.add_alarm_action(cloudwatch_actions.SnsAction(self.monitoring_topic))
@@ -94,7 +148,7 @@ class ResilientN8n(Construct):
             "WorkflowDLQ",
             queue_name=f"n8n-{self.environment}-workflow-dlq",
             retention_period=Duration.days(14),
-            encryption=sqs.QueueEncryption.KMS_MANAGED,
+            encryption=sqs.QueueEncryption.SQS_MANAGED,
             visibility_timeout=Duration.minutes(30),  # Longer for workflows
         )
 
@@ -104,7 +158,7 @@ class ResilientN8n(Construct):
             "WorkflowDLQAlarm",
             alarm_name=f"n8n-{self.environment}-workflow-dlq-messages",
             alarm_description="Failed workflows in dead letter queue",
-            metric=dlq.metric_approximate_number_of_messages_visible(),
+            metric=dlq.metric_approximate_number_of_messages_visible(period=Duration.minutes(5)),
             threshold=10,
             evaluation_periods=2,
             datapoints_to_alarm=2,
@@ -117,101 +171,18 @@ class ResilientN8n(Construct):
 
         return dlq
 
-    def _create_circuit_breaker(self) -> lambda_.Function:
+    def _create_circuit_breaker(self) -> lambda_.Alias:
         """Create Lambda function for circuit breaker pattern."""
         # Create Lambda function for circuit breaker logic
         circuit_breaker_fn = lambda_.Function(
             self,
             "CircuitBreaker",
             function_name=f"n8n-{self.environment}-circuit-breaker",
-            runtime=lambda_.Runtime.PYTHON_3_11,
+            runtime=_LAMBDA_RUNTIME,
+            snap_start=lambda_.SnapStartConf.ON_PUBLISHED_VERSIONS,
+            architecture=lambda_.Architecture.ARM_64,
             handler="index.handler",
-            code=lambda_.Code.from_inline(
-                """
-import json
-import boto3
-import os
-from datetime import datetime, timedelta
-
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table(os.environ['CIRCUIT_STATE_TABLE'])
-cloudwatch = boto3.client('cloudwatch')
-
-def handler(event, context):
-    service_name = event.get('service_name')
-    action = event.get('action', 'check')  # check, open, close, half-open
-
-    if action == 'check':
-        # Check circuit state
-        response = table.get_item(Key={'service_name': service_name})
-        item = response.get('Item', {})
-
-        state = item.get('state', 'closed')
-        if state == 'open':
-            # Check if it's time to try half-open
-            open_time = datetime.fromisoformat(item.get('open_time', ''))
-            if datetime.now() - open_time > timedelta(minutes=5):
-                # Try half-open
-                table.update_item(
-                    Key={'service_name': service_name},
-                    UpdateExpression='SET #state = :state',
-                    ExpressionAttributeNames={'#state': 'state'},
-                    ExpressionAttributeValues={':state': 'half-open'}
-                )
-                return {'state': 'half-open', 'allow_request': True}
-            else:
-                return {'state': 'open', 'allow_request': False}
-
-        return {'state': state, 'allow_request': state != 'open'}
-
-    elif action == 'record_failure':
-        # Record failure and potentially open circuit
-        failure_count = event.get('failure_count', 1)
-        threshold = int(os.environ.get('FAILURE_THRESHOLD', '5'))
-
-        if failure_count >= threshold:
-            # Open circuit
-            table.put_item(Item={
-                'service_name': service_name,
-                'state': 'open',
-                'open_time': datetime.now().isoformat(),
-                'failure_count': failure_count
-            })
-
-            # Send metric
-            cloudwatch.put_metric_data(
-                Namespace='N8n/CircuitBreaker',
-                MetricData=[{
-                    'MetricName': 'CircuitOpened',
-                    'Value': 1,
-                    'Unit': 'Count',
-                    'Dimensions': [
-                        {'Name': 'ServiceName', 'Value': service_name},
-                        {'Name': 'Environment', 'Value': os.environ['ENVIRONMENT']}
-                    ]
-                }]
-            )
-
-            return {'state': 'open', 'message': 'Circuit opened due to failures'}
-
-        return {'state': 'closed', 'failure_count': failure_count}
-
-    elif action == 'record_success':
-        # Record success and potentially close circuit
-        table.update_item(
-            Key={'service_name': service_name},
-            UpdateExpression='SET #state = :state, failure_count = :count',
-            ExpressionAttributeNames={'#state': 'state'},
-            ExpressionAttributeValues={
-                ':state': 'closed',
-                ':count': 0
-            }
-        )
-        return {'state': 'closed', 'message': 'Circuit closed after success'}
-
-    return {'error': 'Invalid action'}
-"""
-            ),
+            code=_handler_code("circuit_breaker"),
             timeout=Duration.seconds(30),
             memory_size=256,
             environment={
@@ -225,111 +196,53 @@ def handler(event, context):
         # Create DynamoDB table for circuit state
         from aws_cdk import aws_dynamodb as dynamodb
 
+        is_production = self.environment == "production"
         circuit_state_table = dynamodb.Table(
             self,
             "CircuitStateTable",
             table_name=f"n8n-{self.environment}-circuit-state",
             partition_key=dynamodb.Attribute(name="service_name", type=dynamodb.AttributeType.STRING),
             billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
-            removal_policy=RemovalPolicy.DESTROY if self.environment != "production" else RemovalPolicy.RETAIN,
-            point_in_time_recovery=self.environment == "production",
+            removal_policy=RemovalPolicy.RETAIN_ON_UPDATE_OR_DELETE if is_production else RemovalPolicy.DESTROY,
+            point_in_time_recovery=is_production,
+            deletion_protection=is_production,
+            time_to_live_attribute="ttl",
         )
 
         # Grant permissions
         circuit_state_table.grant_read_write_data(circuit_breaker_fn)
-        circuit_breaker_fn.add_to_role_policy(
-            iam.PolicyStatement(
-                actions=["cloudwatch:PutMetricData"],
-                resources=["*"],
-            )
-        )
 
         # Allow n8n to invoke circuit breaker
-        circuit_breaker_fn.grant_invoke(self.compute_stack.n8n_service.task_definition.task_role)
+        circuit_breaker = circuit_breaker_fn.add_alias(_LIVE_ALIAS)
+        circuit_breaker.grant_invoke(self.compute_stack.n8n_service.task_definition.task_role)
+
+        # Keep a container warm; SnapStart rules out provisioned concurrency on the same version
+        events.Rule(
+            self,
+            "CircuitBreakerWarmup",
+            rule_name=f"n8n-{self.environment}-circuit-breaker-warmup",
+            schedule=events.Schedule.rate(Duration.minutes(4)),
+            targets=[
+                events_targets.LambdaFunction(
+                    circuit_breaker,
+                    event=events.RuleTargetInput.from_object({"action": "warmup"}),
+                )
+            ],
+        )
 
-        return circuit_breaker_fn
+        return circuit_breaker
 
-    def _create_retry_handler(self) -> lambda_.Function:
+    def _create_retry_handler(self) -> lambda_.Alias:
         """Create Lambda function for intelligent retry handling."""
         retry_handler_fn = lambda_.Function(
             self,
             "RetryHandler",
             function_name=f"n8n-{self.environment}-retry-handler",
-            runtime=lambda_.Runtime.PYTHON_3_11,
+            runtime=_LAMBDA_RUNTIME,
+            snap_start=lambda_.SnapStartConf.ON_PUBLISHED_VERSIONS,
+            architecture=lambda_.Architecture.ARM_64,
             handler="index.handler",
-            code=lambda_.Code.from_inline(
-                """
-import json
-import boto3
-import os
-import time
-import random
-from datetime import datetime
-
-sqs = boto3.client('sqs')
-cloudwatch = boto3.client('cloudwatch')
-
-def exponential_backoff(retry_count, base_delay=1, max_delay=300):
-    \"\"\"Calculate exponential backoff with jitter.\"\"\"
-    delay = min(base_delay * (2 ** retry_count), max_delay)
-    jitter = random.uniform(0, delay * 0.1)  # 10% jitter
-    return delay + jitter
-
-def handler(event, context):
-    # Parse retry request
-    request = json.loads(event['Records'][0]['body'])
-
-    retry_count = request.get('retry_count', 0)
-    max_retries = int(os.environ.get('MAX_RETRIES', '3'))
-    workflow_id = request.get('workflow_id')
-    webhook_url = request.get('webhook_url')
-    payload = request.get('payload')
-
-    if retry_count >= max_retries:
-        # Send to DLQ
-        dlq_url = os.environ['DLQ_URL']
-        sqs.send_message(
-            QueueUrl=dlq_url,
-            MessageBody=json.dumps({
-                'workflow_id': workflow_id,
-                'webhook_url': webhook_url,
-                'payload': payload,
-                'failed_at': datetime.now().isoformat(),
-                'retry_count': retry_count,
-                'reason': 'Max retries exceeded'
-            })
-        )
-
-        # Send metric
-        cloudwatch.put_metric_data(
-            Namespace='N8n/Retry',
-            MetricData=[{
-                'MetricName': 'RetryExhausted',
-                'Value': 1,
-                'Unit': 'Count',
-                'Dimensions': [
-                    {'Name': 'Environment', 'Value': os.environ['ENVIRONMENT']}
-                ]
-            }]
-        )
-
-        return {'status': 'failed', 'reason': 'Max retries exceeded'}
-
-    # Calculate backoff
-    delay = exponential_backoff(retry_count)
-
-    # Wait (in real implementation, would reschedule)
-    time.sleep(min(delay, 5))  # Cap at 5 seconds for Lambda
-
-    # In real implementation, would call n8n API to retry
-    # For now, just return success
-    return {
-        'status': 'retried',
-        'retry_count': retry_count + 1,
-        'delay': delay
-    }
-"""
-            ),
+            code=_handler_code("retry_handler"),
             timeout=Duration.minutes(1),
             memory_size=256,
             environment={
@@ -337,7 +250,6 @@ def handler(event, context):
                 "DLQ_URL": self.workflow_dlq.queue_url,
                 "ENVIRONMENT": self.environment,
             },
-            reserved_concurrent_executions=10,  # Limit concurrency
         )
 
         # Create retry queue
@@ -346,160 +258,84 @@ def handler(event, context):
             "RetryQueue",
             queue_name=f"n8n-{self.environment}-retry-queue",
             visibility_timeout=Duration.minutes(2),
-            encryption=sqs.QueueEncryption.KMS_MANAGED,
+            encryption=sqs.QueueEncryption.SQS_MANAGED,
         )
 
         # Add Lambda trigger
-        retry_handler_fn.add_event_source(
-            lambda_.SqsEventSource(
+        retry_handler = retry_handler_fn.add_alias(_LIVE_ALIAS)
+        retry_handler.add_event_source(
+            lambda_event_sources.SqsEventSource(
                 retry_queue,
-                batch_size=1,
-                max_batching_window_time=Duration.seconds(5),
+                batch_size=10,
+                max_batching_window=Duration.seconds(5),
+                report_batch_item_failures=True,
+                # Throttle at the poller rather than with reserved concurrency, so throttling never fails messages
+                max_concurrency=self.retry_concurrency,
             )
         )
 
+        # Backoff is scheduled by sending the message back with a delay
+        retry_handler_fn.add_environment("RETRY_QUEUE_URL", retry_queue.queue_url)
+
         # Grant permissions
         retry_queue.grant_consume_messages(retry_handler_fn)
+        retry_queue.grant_send_messages(retry_handler_fn)
         self.workflow_dlq.grant_send_messages(retry_handler_fn)
-        retry_handler_fn.add_to_role_policy(
-            iam.PolicyStatement(
-                actions=["cloudwatch:PutMetricData"],
-                resources=["*"],
-            )
-        )
 
         # Allow n8n to send to retry queue
         retry_queue.grant_send_messages(self.compute_stack.n8n_service.task_definition.task_role)
 
-        return retry_handler_fn
+        return retry_handler
 
     def _create_health_check_automation(self) -> None:
         """Create automated health check and recovery."""
+        service = self.compute_stack.n8n_service.service
+        network_stack = self.compute_stack.network_stack
+
+        environment = {
+            "CLUSTER_NAME": self.compute_stack.cluster.cluster_name,
+            "SERVICE_NAME": service.service_name,
+            "SNS_TOPIC_ARN": self.monitoring_topic.topic_arn,
+            "ENVIRONMENT": self.environment,
+        }
+        vpc_config = {}
+        # Lambda ENIs never get a public IP, so from inside the VPC the ECS and SNS APIs are only reachable
+        # through NAT. Probe n8n over HTTP only when it is registered in Cloud Map and private subnets exist;
+        # otherwise the function stays outside the VPC and checks task counts alone.
+        if service.cloud_map_service and network_stack.vpc.private_subnets:
+            environment["HEALTH_URL"] = (
+                f"http://{service.cloud_map_service.service_name}."
+                f"{service.cloud_map_service.namespace.namespace_name}:5678/healthz"
+            )
+            vpc_config = {
+                "vpc": network_stack.vpc,
+                "vpc_subnets": ec2.SubnetSelection(subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS),
+                "security_groups": [network_stack.n8n_security_group],
+            }
+
         # Create Lambda for health checks
         health_check_fn = lambda_.Function(
             self,
             "HealthCheck",
             function_name=f"n8n-{self.environment}-health-check",
-            runtime=lambda_.Runtime.PYTHON_3_11,
+            runtime=_LAMBDA_RUNTIME,
+            snap_start=lambda_.SnapStartConf.ON_PUBLISHED_VERSIONS,
+            architecture=lambda_.Architecture.ARM_64,
             handler="index.handler",
-            code=lambda_.Code.from_inline(
-                """
-import json
-import boto3
-import urllib3
-import os
-from datetime import datetime
-
-ecs = boto3.client('ecs')
-cloudwatch = boto3.client('cloudwatch')
-sns = boto3.client('sns')
-http = urllib3.PoolManager()
-
-def handler(event, context):
-    cluster_name = os.environ['CLUSTER_NAME']
-    service_name = os.environ['SERVICE_NAME']
-    health_url = os.environ['HEALTH_URL']
-
-    # Check ECS service health
-    response = ecs.describe_services(
-        cluster=cluster_name,
-        services=[service_name]
-    )
-
-    service = response['services'][0]
-    running_count = service['runningCount']
-    desired_count = service['desiredCount']
-
-    # Check if service is healthy
-    if running_count < desired_count:
-        # Service is unhealthy
-        message = f"n8n service unhealthy: {running_count}/{desired_count} tasks running"
-
-        # Send notification
-        sns.publish(
-            TopicArn=os.environ['SNS_TOPIC_ARN'],
-            Subject=f"n8n Health Check Failed - {os.environ['ENVIRONMENT']}",
-            Message=message
-        )
-
-        # Send metric
-        cloudwatch.put_metric_data(
-            Namespace='N8n/Health',
-            MetricData=[{
-                'MetricName': 'ServiceUnhealthy',
-                'Value': 1,
-                'Unit': 'Count',
-                'Dimensions': [
-                    {'Name': 'Environment', 'Value': os.environ['ENVIRONMENT']}
-                ]
-            }]
-        )
-
-        # Attempt recovery if too many tasks are failing
-        if running_count == 0:
-            ecs.update_service(
-                cluster=cluster_name,
-                service=service_name,
-                forceNewDeployment=True
-            )
-            return {'status': 'recovery_initiated', 'message': message}
-
-    # Try HTTP health check
-    try:
-        resp = http.request('GET', health_url, timeout=10)
-        if resp.status != 200:
-            raise Exception(f"Health check returned {resp.status}")
-    except Exception as e:
-        # HTTP health check failed
-        cloudwatch.put_metric_data(
-            Namespace='N8n/Health',
-            MetricData=[{
-                'MetricName': 'HealthCheckFailed',
-                'Value': 1,
-                'Unit': 'Count',
-                'Dimensions': [
-                    {'Name': 'Environment', 'Value': os.environ['ENVIRONMENT']}
-                ]
-            }]
-        )
-        return {'status': 'unhealthy', 'error': str(e)}
-
-    return {'status': 'healthy', 'running_tasks': running_count}
-"""
-            ),
+            code=_handler_code("health_check"),
             timeout=Duration.seconds(30),
             memory_size=256,
-            environment={
-                "CLUSTER_NAME": self.compute_stack.cluster.cluster_name,
-                "SERVICE_NAME": self.compute_stack.n8n_service.service.service_name,
-                "HEALTH_URL": (
-                    f"http://{self.compute_stack.n8n_service.service.cloud_map_service.service_name}."
-                    f"{self.compute_stack.n8n_service.service.cloud_map_service.namespace.namespace_name}"
-                    f":5678/healthz"
-                ),
-                "SNS_TOPIC_ARN": self.monitoring_topic.topic_arn,
-                "ENVIRONMENT": self.environment,
-            },
-            vpc=self.compute_stack.network_stack.vpc,
-            vpc_subnets=self.compute_stack.network_stack.subnets,
+            environment=environment,
+            **vpc_config,
         )
 
         # Grant permissions
         health_check_fn.add_to_role_policy(
             iam.PolicyStatement(
-                actions=[
-                    "ecs:DescribeServices",
-                    "ecs:UpdateService",
-                ],
+                actions=["ecs:DescribeServices"],
                 resources=["*"],  # Can be scoped down to specific service
             )
         )
-        health_check_fn.add_to_role_policy(
-            iam.PolicyStatement(
-                actions=["cloudwatch:PutMetricData"],
-                resources=["*"],
-            )
-        )
         self.monitoring_topic.grant_publish(health_check_fn)
 
         # Schedule health checks
@@ -509,34 +345,97 @@ def handler(event, context):
             rule_name=f"n8n-{self.environment}-health-check",
             schedule=events.Schedule.rate(Duration.minutes(5)),
         )
-        health_check_rule.add_target(events_targets.LambdaFunction(health_check_fn))
+        health_check_rule.add_target(events_targets.LambdaFunction(health_check_fn.add_alias(_LIVE_ALIAS)))
 
-    def _create_auto_recovery(self) -> None:
-        """Create auto-recovery alarms for the ECS service."""
-        # Create alarm for service with no running tasks
-        no_tasks_alarm = cloudwatch.Alarm(
+        self._create_recovery_workflow()
+
+    def _create_recovery_workflow(self) -> None:
+        """Force a new deployment when no n8n tasks are running, without a Lambda."""
+        service = self.compute_stack.n8n_service.service
+
+        # Recorded by the health check each time it sees zero running tasks
+        no_running_tasks_alarm = cloudwatch.Alarm(
             self,
-            "NoRunningTasksAlarm",
-            alarm_name=f"n8n-{self.environment}-no-running-tasks",
-            alarm_description="n8n service has no running tasks",
+            "HealthCheckNoRunningTasksAlarm",
+            alarm_name=f"n8n-{self.environment}-health-check-no-running-tasks",
+            alarm_description="Health check found no running n8n tasks; triggers a forced redeployment",
             metric=cloudwatch.Metric(
-                namespace="AWS/ECS",
-                metric_name="RunningTaskCount",
-                dimensions_map={
-                    "ServiceName": self.compute_stack.n8n_service.service.service_name,
-                    "ClusterName": self.compute_stack.cluster.cluster_name,
-                },
-                statistic="Average",
+                namespace="N8n/Health",
+                metric_name="NoRunningTasks",
+                dimensions_map={"Environment": self.environment},
+                statistic="Sum",
+                period=Duration.minutes(5),
             ),
-            threshold=0.5,  # Less than 1 task
-            evaluation_periods=2,
-            comparison_operator=cloudwatch.ComparisonOperator.LESS_THAN_THRESHOLD,
-            treat_missing_data=cloudwatch.TreatMissingData.BREACHING,
+            threshold=1,
+            evaluation_periods=1,
+            comparison_operator=cloudwatch.ComparisonOperator.GREATER_THAN_OR_EQUAL_TO_THRESHOLD,
+            treat_missing_data=cloudwatch.TreatMissingData.NOT_BREACHING,
+        )
+
+        # Step Functions calls the ECS API directly through its SDK integration
+        force_new_deployment = sfn_tasks.CallAwsService(
+            self,
+            "ForceNewDeployment",
+            service="ecs",
+            action="updateService",
+            parameters={
+                "Cluster": self.compute_stack.cluster.cluster_name,
+                "Service": service.service_name,
+                "ForceNewDeployment": True,
+            },
+            iam_resources=[service.service_arn],
+        )
+        recovery = sfn.StateMachine(
+            self,
+            "RecoveryStateMachine",
+            state_machine_name=f"n8n-{self.environment}-recovery",
+            definition_body=sfn.DefinitionBody.from_chainable(force_new_deployment),
+        )
+
+        recovery_alarms = [no_running_tasks_alarm]
+        if self.container_insights:
+            # Published by Container Insights, so zero tasks is still caught if the health check cannot run
+            recovery_alarms.append(
+                cloudwatch.Alarm(
+                    self,
+                    "ContainerInsightsNoRunningTasksAlarm",
+                    alarm_name=f"n8n-{self.environment}-no-running-tasks",
+                    alarm_description="Container Insights reports no running n8n tasks; triggers a forced redeployment",
+                    metric=cloudwatch.Metric(
+                        namespace="ECS/ContainerInsights",
+                        metric_name="RunningTaskCount",
+                        dimensions_map={
+                            "ClusterName": self.compute_stack.cluster.cluster_name,
+                            "ServiceName": service.service_name,
+                        },
+                        statistic="Maximum",
+                        period=Duration.minutes(5),
+                    ),
+                    threshold=1,
+                    evaluation_periods=1,
+                    comparison_operator=cloudwatch.ComparisonOperator.LESS_THAN_THRESHOLD,
+                    treat_missing_data=cloudwatch.TreatMissingData.NOT_BREACHING,
+                )
+            )
+
+        events.Rule(
+            self,
+            "RecoveryRule",
+            rule_name=f"n8n-{self.environment}-recovery",
+            event_pattern=events.EventPattern(
+                source=["aws.cloudwatch"],
+                detail_type=["CloudWatch Alarm State Change"],
+                resources=[alarm.alarm_arn for alarm in recovery_alarms],
+                detail={"state": {"value": ["ALARM"]}},
+            ),
+            targets=[events_targets.SfnStateMachine(recovery)],
         )
 
-        # Add alarm action
-        no_tasks_alarm.add_alarm_action(cloudwatch_actions.SnsAction(self.monitoring_topic))
+    def _create_auto_recovery(self) -> None:
+        """Create auto-recovery alarms for the ECS service.
 
+        Zero running tasks is covered by the health check alarm in _create_recovery_workflow.
+        """
         # Create alarm for high error rate
         error_rate_alarm = cloudwatch.Alarm(
             self,
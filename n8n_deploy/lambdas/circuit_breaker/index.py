@@ -0,0 +1,116 @@
+"""Circuit breaker state machine for calls from n8n to external services."""
+
+import json
+import os
+import time
+
+import boto3
+
+# Low-level client: the resource layer loads its model at import and only one call is made per invocation
+ddb = boto3.client("dynamodb")
+TABLE = os.environ["CIRCUIT_STATE_TABLE"]
+FAILURE_THRESHOLD = int(os.environ.get("FAILURE_THRESHOLD", "5"))
+OPEN_ROW_TTL_SECONDS = 24 * 60 * 60
+HALF_OPEN_AFTER_SECONDS = 5 * 60
+
+# Per-container cache of recent "check" results, so a burst of checks costs one read per second
+_CACHE: dict[str, tuple[float, dict]] = {}
+_TTL = 1.0
+
+
+def handler(event, context):
+    service_name = event.get("service_name")
+    action = event.get("action", "check")  # check, open, close, half-open
+
+    if action == "warmup":
+        # Scheduled keep-warm ping; touches no state
+        return {"status": "warm"}
+
+    if action == "check":
+        now = time.monotonic()
+        cached = _CACHE.get(service_name)
+        if cached and now - cached[0] < _TTL:
+            return cached[1]
+
+        # Check circuit state
+        response = ddb.get_item(TableName=TABLE, Key={"service_name": {"S": service_name}})
+        item = response.get("Item", {})
+
+        state = item.get("state", {}).get("S", "closed")
+        result = {"state": state, "allow_request": state != "open"}
+        if state == "open":
+            # Check if it's time to try half-open
+            # Epoch seconds; rows written before the switch from ISO strings count as expired
+            open_time = int(item.get("open_time", {}).get("N", "0"))
+            if time.time() - open_time > HALF_OPEN_AFTER_SECONDS:
+                # Try half-open
+                ddb.update_item(
+                    TableName=TABLE,
+                    Key={"service_name": {"S": service_name}},
+                    UpdateExpression="SET #state = :state",
+                    ExpressionAttributeNames={"#state": "state"},
+                    ExpressionAttributeValues={":state": {"S": "half-open"}},
+                )
+                result = {"state": "half-open", "allow_request": True}
+
+        _CACHE[service_name] = (now, result)
+        return result
+
+    # Anything recorded below changes the state, so the next check must read it
+    _CACHE.pop(service_name, None)
+
+    if action == "record_failure":
+        # Record failure and potentially open circuit
+        failure_count = event.get("failure_count", 1)
+        if failure_count >= FAILURE_THRESHOLD:
+            # Open circuit
+            open_time = int(time.time())
+            ddb.put_item(
+                TableName=TABLE,
+                Item={
+                    "service_name": {"S": service_name},
+                    "state": {"S": "open"},
+                    "open_time": {"N": str(open_time)},
+                    "failure_count": {"N": str(failure_count)},
+                    # Expired open rows are removed by the table's TTL
+                    "ttl": {"N": str(open_time + OPEN_ROW_TTL_SECONDS)},
+                },
+            )
+
+            # Emit metric as an Embedded Metric Format log line; CloudWatch extracts it without an API call
+            print(
+                json.dumps(
+                    {
+                        "_aws": {
+                            "Timestamp": int(time.time() * 1000),
+                            "CloudWatchMetrics": [
+                                {
+                                    "Namespace": "N8n/CircuitBreaker",
+                                    "Dimensions": [["ServiceName", "Environment"]],
+                                    "Metrics": [{"Name": "CircuitOpened", "Unit": "Count"}],
+                                }
+                            ],
+                        },
+                        "ServiceName": service_name,
+                        "Environment": os.environ["ENVIRONMENT"],
+                        "CircuitOpened": 1,
+                    }
+                )
+            )
+
+            return {"state": "open", "message": "Circuit opened due to failures"}
+
+        return {"state": "closed", "failure_count": failure_count}
+
+    elif action == "record_success":
+        # Record success and potentially close circuit
+        ddb.update_item(
+            TableName=TABLE,
+            Key={"service_name": {"S": service_name}},
+            UpdateExpression="SET #state = :state, failure_count = :count",
+            ExpressionAttributeNames={"#state": "state"},
+            ExpressionAttributeValues={":state": {"S": "closed"}, ":count": {"N": "0"}},
+        )
+        return {"state": "closed", "message": "Circuit closed after success"}
+
+    return {"error": "Invalid action"}
@@ -0,0 +1,77 @@
+"""Scheduled health check and recovery for the n8n ECS service."""
+
+import os
+from http.client import HTTPConnection
+from urllib.parse import urlsplit
+
+import boto3
+from emf import MetricBuffer
+
+ecs = boto3.client("ecs")
+sns = boto3.client("sns")
+
+# A single GET does not need a pool manager; http.client keeps urllib3 off the import path.
+# Only set when the function runs in the VPC and can reach n8n through Cloud Map.
+_HEALTH_URL = urlsplit(os.environ["HEALTH_URL"]) if "HEALTH_URL" in os.environ else None
+
+# Counts are written as one Embedded Metric Format log line when the invocation ends
+metrics = MetricBuffer("N8n/Health")
+
+
+def handler(event, context):
+    try:
+        return _handle(event)
+    finally:
+        metrics.flush()
+
+
+def _handle(event):
+    cluster_name = os.environ["CLUSTER_NAME"]
+    service_name = os.environ["SERVICE_NAME"]
+
+    # Check ECS service health
+    response = ecs.describe_services(cluster=cluster_name, services=[service_name])
+
+    service = response["services"][0]
+    running_count = service["runningCount"]
+    desired_count = service["desiredCount"]
+
+    # Check if service is healthy
+    if running_count < desired_count:
+        # Service is unhealthy
+        message = f"n8n service unhealthy: {running_count}/{desired_count} tasks running"
+
+        # Send notification
+        sns.publish(
+            TopicArn=os.environ["SNS_TOPIC_ARN"],
+            Subject=f"n8n Health Check Failed - {os.environ['ENVIRONMENT']}",
+            Message=message,
+        )
+
+        # Record metric
+        metrics.record("ServiceUnhealthy")
+
+        # Recovery is triggered by the alarm on this metric, not from here
+        if running_count == 0:
+            metrics.record("NoRunningTasks")
+            return {"status": "recovery_requested", "message": message}
+
+    if _HEALTH_URL is None:
+        return {"status": "healthy", "running_tasks": running_count}
+
+    # Try HTTP health check
+    try:
+        conn = HTTPConnection(_HEALTH_URL.hostname, _HEALTH_URL.port, timeout=10)
+        try:
+            conn.request("GET", _HEALTH_URL.path or "/")
+            status = conn.getresponse().status
+        finally:
+            conn.close()
+        if status != 200:
+            raise Exception(f"Health check returned {status}")
+    except Exception as e:
+        # HTTP health check failed
+        metrics.record("HealthCheckFailed")
+        return {"status": "unhealthy", "error": str(e)}
+
+    return {"status": "healthy", "running_tasks": running_count}
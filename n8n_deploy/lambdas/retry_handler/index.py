@@ -0,0 +1,88 @@
+"""Retry handler with exponential backoff for failed n8n workflow requests."""
+
+import json
+import os
+import random
+from datetime import datetime
+
+import boto3
+from emf import MetricBuffer
+from snapshot_restore_py import register_after_restore
+
+sqs = boto3.client("sqs")
+MAX_RETRIES = int(os.environ.get("MAX_RETRIES", "3"))
+MAX_DELAY_SECONDS = 900  # SQS DelaySeconds limit
+
+# Counts are written as one Embedded Metric Format log line when the invocation ends
+metrics = MetricBuffer("N8n/Retry")
+
+
+@register_after_restore
+def reseed_random():
+    # Every instance restored from the snapshot would otherwise share the same jitter sequence
+    random.seed()
+
+
+def exponential_backoff(retry_count, base_delay=1, max_delay=300):
+    """Calculate exponential backoff with jitter."""
+    delay = min(base_delay * (2**retry_count), max_delay)
+    jitter = random.uniform(0, delay * 0.1)  # 10% jitter
+    return delay + jitter
+
+
+def handler(event, context):
+    # Failed records are reported individually so the rest of the batch is not redelivered
+    failed = []
+    try:
+        for record in event["Records"]:
+            try:
+                _handle(json.loads(record["body"]))
+            except Exception:
+                failed.append(record["messageId"])
+    finally:
+        metrics.flush()
+
+    return {"batchItemFailures": [{"itemIdentifier": message_id} for message_id in failed]}
+
+
+def _handle(request):
+    retry_count = request.get("retry_count", 0)
+    workflow_id = request.get("workflow_id")
+    webhook_url = request.get("webhook_url")
+    payload = request.get("payload")
+
+    if retry_count >= MAX_RETRIES:
+        # Send to DLQ
+        dlq_url = os.environ["DLQ_URL"]
+        sqs.send_message(
+            QueueUrl=dlq_url,
+            MessageBody=json.dumps(
+                {
+                    "workflow_id": workflow_id,
+                    "webhook_url": webhook_url,
+                    "payload": payload,
+                    "failed_at": datetime.now().isoformat(),
+                    "retry_count": retry_count,
+                    "reason": "Max retries exceeded",
+                }
+            ),
+        )
+
+        # Record metric
+        metrics.record("RetryExhausted")
+
+        return {"status": "failed", "reason": "Max retries exceeded"}
+
+    if not request.get("scheduled"):
+        # Let SQS hold the message for the backoff instead of sleeping in the function
+        delay = exponential_backoff(retry_count)
+        sqs.send_message(
+            QueueUrl=os.environ["RETRY_QUEUE_URL"],
+            MessageBody=json.dumps({**request, "scheduled": True}),
+            DelaySeconds=min(int(delay), MAX_DELAY_SECONDS),
+        )
+        return {"status": "scheduled", "retry_count": retry_count, "delay": delay}
+
+    # In real implementation, would call n8n API to retry
+    # For now, just return success
+    return {"status": "retried", "retry_count": retry_count + 1}
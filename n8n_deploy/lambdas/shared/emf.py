@@ -0,0 +1,41 @@
+"""Embedded Metric Format helpers shared by the resilience Lambda handlers.
+
+Bundling copies this module next to each handler's ``index.py``.
+"""
+
+import json
+import os
+import time
+
+
+class MetricBuffer:
+    """Metric counts buffered and written as one Embedded Metric Format log line when the invocation ends."""
+
+    def __init__(self, namespace):
+        self.namespace = namespace
+        self._counts = {}
+
+    def record(self, name):
+        """Count a metric until the end of the invocation."""
+        self._counts[name] = self._counts.get(name, 0) + 1
+
+    def flush(self):
+        """Write buffered counts to the log; CloudWatch extracts them as metrics without an API call."""
+        if not self._counts:
+            return
+        metrics = [{"Name": name, "Unit": "Count"} for name in self._counts]
+        print(
+            json.dumps(
+                {
+                    "_aws": {
+                        "Timestamp": int(time.time() * 1000),
+                        "CloudWatchMetrics": [
+                            {"Namespace": self.namespace, "Dimensions": [["Environment"]], "Metrics": metrics}
+                        ],
+                    },
+                    "Environment": os.environ["ENVIRONMENT"],
+                    **self._counts,
+                }
+            )
+        )
+        self._counts.clear()
@@ -32,7 +32,8 @@ class ComputeStack(N8nBaseStack):
         environment: str,
         network_stack: NetworkStack,
         storage_stack: StorageStack,
-        database_endpoint: Optional[str] = None,
+        database_host: Optional[str] = None,
+        database_port: Optional[str] = None,
         database_secret: Optional[secretsmanager.ISecret] = None,
         **kwargs,
     ) -> None:
@@ -45,7 +46,8 @@ class ComputeStack(N8nBaseStack):
             environment: Environment name
             network_stack: Network stack with VPC and security groups
             storage_stack: Storage stack with EFS
-            database_endpoint: Optional RDS endpoint
+            database_host: Optional database hostname
+            database_port: Optional database port
             database_secret: Optional database credentials secret
             **kwargs: Additional stack properties
         """
@@ -73,7 +75,8 @@ class ComputeStack(N8nBaseStack):
             access_point=storage_stack.n8n_access_point,
             env_config=self.env_config,
             environment=environment,
-            database_endpoint=database_endpoint,
+            database_host=database_host,
+            database_port=database_port,
             database_secret=database_secret,
         )
 
@@ -188,6 +191,7 @@ class ComputeStack(N8nBaseStack):
             compute_stack=self,
             monitoring_topic=monitoring_topic,
             environment=self.environment,
+            container_insights=self._should_enable_container_insights(),
         )
 
         # Pass DLQ URLs to n8n container as environment variables
@@ -1,6 +1,6 @@
 """Database stack for optional RDS PostgreSQL."""
 
-from aws_cdk import Duration
+from aws_cdk import Duration, Token
 from aws_cdk import aws_ec2 as ec2
 from aws_cdk import aws_logs as logs
 from aws_cdk import aws_rds as rds
@@ -89,6 +89,8 @@ class DatabaseStack(N8nBaseStack):
         # Extract endpoint from secret (this is a simplified version)
         # In practice, you'd need to handle this more robustly
         self.endpoint = None  # Will be resolved from secret at runtime
+        self.endpoint_address = None
+        self.endpoint_port = None
 
     def _create_aurora_serverless(self) -> None:
         """Create Aurora Serverless v2 PostgreSQL cluster."""
@@ -158,6 +160,8 @@ class DatabaseStack(N8nBaseStack):
         )
 
         self.endpoint = self.cluster.cluster_endpoint.socket_address
+        self.endpoint_address = self.cluster.cluster_endpoint.hostname
+        self.endpoint_port = Token.as_string(self.cluster.cluster_endpoint.port)
 
     def _create_rds_instance(self) -> None:
         """Create standard RDS PostgreSQL instance."""
@@ -220,7 +224,9 @@ class DatabaseStack(N8nBaseStack):
             auto_minor_version_upgrade=False,  # Control updates
         )
 
-        self.endpoint = self.instance.db_instance_endpoint_address + ":" + self.instance.db_instance_endpoint_port
+        self.endpoint_address = self.instance.db_instance_endpoint_address
+        self.endpoint_port = self.instance.db_instance_endpoint_port
+        self.endpoint = self.endpoint_address + ":" + self.endpoint_port
 
     def _add_outputs(self) -> None:
         """Add stack outputs."""
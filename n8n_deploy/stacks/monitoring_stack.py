@@ -5,6 +5,7 @@ from typing import Optional
 from aws_cdk import Duration
 from aws_cdk import aws_cloudwatch as cloudwatch
 from aws_cdk import aws_cloudwatch_actions as cloudwatch_actions
+from aws_cdk import aws_efs as efs
 from aws_cdk import aws_logs as logs
 from aws_cdk import aws_sns as sns
 from aws_cdk import aws_sns_subscriptions as sns_subscriptions
@@ -162,10 +163,18 @@ class MonitoringStack(N8nBaseStack):
         task_count_alarm.add_alarm_action(alarm_action)
 
     def _create_storage_alarms(self) -> None:
-        """Create alarms for storage resources."""
+        """Create alarms for storage resources.
+
+        Burst credits and the I/O limit only throttle a bursting file system, so nothing is
+        created for elastic or provisioned throughput.
+        """
+        if self.storage_stack.throughput_mode != efs.ThroughputMode.BURSTING:
+            return
+
         alarm_action = cloudwatch_actions.SnsAction(self.alarm_topic)
+        dimensions = {"FileSystemId": self.storage_stack.file_system.file_system_id}
 
-        # EFS burst credit balance alarm
+        # EFS burst credit balance alarm, raised roughly an hour before throughput drops to baseline
         burst_credit_alarm = cloudwatch.Alarm(
             self,
             "EfsBurstCreditAlarm",
@@ -174,18 +183,37 @@ class MonitoringStack(N8nBaseStack):
             metric=cloudwatch.Metric(
                 namespace="AWS/EFS",
                 metric_name="BurstCreditBalance",
-                dimensions_map={
-                    "FileSystemId": self.storage_stack.file_system.file_system_id,
-                },
+                dimensions_map=dimensions,
                 statistic="Average",
+                period=Duration.minutes(10),
             ),
-            threshold=1000000000000,  # 1 TB in bytes
+            threshold=192_416_666_667,  # bytes of burst credit
             evaluation_periods=1,
             comparison_operator=cloudwatch.ComparisonOperator.LESS_THAN_THRESHOLD,
             treat_missing_data=cloudwatch.TreatMissingData.NOT_BREACHING,
         )
         burst_credit_alarm.add_alarm_action(alarm_action)
 
+        # EFS general purpose I/O limit alarm
+        io_limit_alarm = cloudwatch.Alarm(
+            self,
+            "EfsIoLimitAlarm",
+            alarm_name=f"{self.stack_prefix}-efs-io-limit-high",
+            alarm_description="EFS is close to its general purpose I/O limit",
+            metric=cloudwatch.Metric(
+                namespace="AWS/EFS",
+                metric_name="PercentIOLimit",
+                dimensions_map=dimensions,
+                statistic="Maximum",
+                period=Duration.minutes(10),
+            ),
+            threshold=80,
+            evaluation_periods=1,
+            comparison_operator=cloudwatch.ComparisonOperator.GREATER_THAN_THRESHOLD,
+            treat_missing_data=cloudwatch.TreatMissingData.NOT_BREACHING,
+        )
+        io_limit_alarm.add_alarm_action(alarm_action)
+
     def _create_database_alarms(self) -> None:
         """Create alarms for database resources."""
         if not hasattr(self.database_stack, "instance") and not hasattr(self.database_stack, "cluster"):
@@ -391,6 +419,27 @@ class MonitoringStack(N8nBaseStack):
 
         # Add storage metrics if available
         if self.storage_stack:
+            # Burst credits only exist in bursting mode; elastic and provisioned file systems graph metered I/O
+            if self.storage_stack.throughput_mode == efs.ThroughputMode.BURSTING:
+                throughput_metric = cloudwatch.Metric(
+                    namespace="AWS/EFS",
+                    metric_name="BurstCreditBalance",
+                    dimensions_map={
+                        "FileSystemId": self.storage_stack.file_system.file_system_id,
+                    },
+                    statistic="Average",
+                    label="Burst Credits",
+                )
+            else:
+                throughput_metric = cloudwatch.Metric(
+                    namespace="AWS/EFS",
+                    metric_name="MeteredIOBytes",
+                    dimensions_map={
+                        "FileSystemId": self.storage_stack.file_system.file_system_id,
+                    },
+                    statistic="Sum",
+                    label="Metered I/O Bytes",
+                )
             dashboard.add_widgets(
                 cloudwatch.GraphWidget(
                     title="EFS Metrics",
@@ -405,17 +454,7 @@ class MonitoringStack(N8nBaseStack):
                             label="Client Connections",
                         ),
                     ],
-                    right=[
-                        cloudwatch.Metric(
-                            namespace="AWS/EFS",
-                            metric_name="BurstCreditBalance",
-                            dimensions_map={
-                                "FileSystemId": self.storage_stack.file_system.file_system_id,
-                            },
-                            statistic="Average",
-                            label="Burst Credits",
-                        ),
-                    ],
+                    right=[throughput_metric],
                     width=12,
                     height=6,
                 ),
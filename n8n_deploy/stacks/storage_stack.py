@@ -1,17 +1,42 @@
 """Storage stack for EFS and backup resources."""
 
-from aws_cdk import Duration, Fn
+from functools import cached_property
+
+from aws_cdk import Duration, Fn, Size
 from aws_cdk import aws_backup as backup
 from aws_cdk import aws_ec2 as ec2
 from aws_cdk import aws_efs as efs
 from aws_cdk import aws_events as events
 from aws_cdk import aws_iam as iam
+from aws_cdk import aws_kms as kms
 from constructs import Construct
 
+from .._utils import nearest
 from ..config.models import N8nConfig
 from .base_stack import N8nBaseStack
 from .network_stack import NetworkStack
 
+# EFS transition-to-IA policies keyed by days
+_LIFECYCLE_POLICY_MAP = {
+    1: efs.LifecyclePolicy.AFTER_1_DAY,
+    7: efs.LifecyclePolicy.AFTER_7_DAYS,
+    14: efs.LifecyclePolicy.AFTER_14_DAYS,
+    30: efs.LifecyclePolicy.AFTER_30_DAYS,
+    60: efs.LifecyclePolicy.AFTER_60_DAYS,
+    90: efs.LifecyclePolicy.AFTER_90_DAYS,
+    180: efs.LifecyclePolicy.AFTER_180_DAYS,
+    270: efs.LifecyclePolicy.AFTER_270_DAYS,
+    365: efs.LifecyclePolicy.AFTER_365_DAYS,
+}
+_LIFECYCLE_DAYS_SORTED = tuple(sorted(_LIFECYCLE_POLICY_MAP))
+
+# Elastic scales with demand instead of draining burst credits on small file systems
+_THROUGHPUT_MODE_MAP = {
+    "elastic": efs.ThroughputMode.ELASTIC,
+    "bursting": efs.ThroughputMode.BURSTING,
+    "provisioned": efs.ThroughputMode.PROVISIONED,
+}
+
 
 class StorageStack(N8nBaseStack):
     """Stack for storage resources (EFS, backups)."""
@@ -38,15 +63,21 @@ class StorageStack(N8nBaseStack):
         super().__init__(scope, construct_id, config, environment, **kwargs)
 
         self.network_stack = network_stack
+        # Read once; both are consulted by the file system and the backup plan
+        self._is_prod = self.is_production()
+        self.backup_config = self.env_config.settings.backup
+        self.efs_config = self.config.defaults.efs if self.config.defaults and self.config.defaults.efs else {}
 
         # Create EFS file system
         self.file_system = self._create_efs_file_system()
 
-        # Create EFS access point for n8n
-        self.n8n_access_point = self._create_n8n_access_point()
+        # Create EFS access point for n8n, unless the service should mount the file system root
+        self.n8n_access_point = (
+            self._create_n8n_access_point() if self.efs_config.get("use_access_point", True) else None
+        )
 
         # Set up backups if enabled
-        if self.env_config.settings.backup and self.env_config.settings.backup.enabled:
+        if self.backup_config and self.backup_config.enabled:
             self._setup_backups()
 
         # Add outputs
@@ -54,26 +85,18 @@ class StorageStack(N8nBaseStack):
 
     def _create_efs_file_system(self) -> efs.FileSystem:
         """Create EFS file system for n8n data."""
-        # Get EFS configuration from defaults
-        efs_config = self.config.defaults.efs if self.config.defaults and self.config.defaults.efs else {}
-        lifecycle_days = efs_config.get("lifecycle_days", 30)
-
-        # Map lifecycle days to available policies
-        lifecycle_policy_map = {
-            1: efs.LifecyclePolicy.AFTER_1_DAY,
-            7: efs.LifecyclePolicy.AFTER_7_DAYS,
-            14: efs.LifecyclePolicy.AFTER_14_DAYS,
-            30: efs.LifecyclePolicy.AFTER_30_DAYS,
-            60: efs.LifecyclePolicy.AFTER_60_DAYS,
-            90: efs.LifecyclePolicy.AFTER_90_DAYS,
-            180: efs.LifecyclePolicy.AFTER_180_DAYS,
-            270: efs.LifecyclePolicy.AFTER_270_DAYS,
-            365: efs.LifecyclePolicy.AFTER_365_DAYS,
-        }
-
-        # Find the closest matching policy
-        closest_days = min(lifecycle_policy_map.keys(), key=lambda x: abs(x - lifecycle_days))
-        lifecycle_policy = lifecycle_policy_map[closest_days]
+        efs_config = self.efs_config
+        lifecycle_days = efs_config.get("lifecycle_days", 7)
+
+        lifecycle_policy = _LIFECYCLE_POLICY_MAP[nearest(_LIFECYCLE_DAYS_SORTED, lifecycle_days)]
+        # Move files back to Standard on first access so re-read history is not billed per IA read
+        out_of_ia_policy = efs.OutOfInfrequentAccessPolicy.AFTER_1_ACCESS if efs_config.get("out_of_ia", True) else None
+        # Kept on the stack so monitoring can tell whether burst credits apply
+        self.throughput_mode = _THROUGHPUT_MODE_MAP[efs_config.get("throughput_mode", "elastic")]
+        provisioned_mibps = efs_config.get("provisioned_throughput_mibps")
+        provisioned_throughput = (
+            Size.mebibytes(provisioned_mibps) if self.throughput_mode == efs.ThroughputMode.PROVISIONED else None
+        )
 
         # Create file system
         file_system = efs.FileSystem(
@@ -84,21 +107,19 @@ class StorageStack(N8nBaseStack):
             vpc_subnets=ec2.SubnetSelection(subnets=self.network_stack.subnets),
             security_group=self.network_stack.efs_security_group,
             encrypted=True,
-            enable_automatic_backups=self.is_production(),
+            enable_automatic_backups=self._is_prod,
             lifecycle_policy=lifecycle_policy,
+            out_of_infrequent_access_policy=out_of_ia_policy,
             performance_mode=efs.PerformanceMode.GENERAL_PURPOSE,
-            throughput_mode=efs.ThroughputMode.BURSTING,
+            throughput_mode=self.throughput_mode,
+            provisioned_throughput_per_second=provisioned_throughput,
             removal_policy=self.removal_policy,
         )
 
         # Add production-specific settings
-        if self.is_production():
+        if self._is_prod:
             # Enable replication to another region if cross-region backup is enabled
-            if (
-                self.env_config.settings.backup
-                and self.env_config.settings.backup.cross_region_backup
-                and self.env_config.settings.backup.backup_regions
-            ):
+            if self.backup_config and self.backup_config.cross_region_backup and self.backup_config.backup_regions:
                 # Note: EFS replication would need to be set up separately
                 # as CDK doesn't directly support it yet
                 pass
@@ -124,14 +145,20 @@ class StorageStack(N8nBaseStack):
 
     def _setup_backups(self) -> None:
         """Set up AWS Backup for EFS."""
-        backup_config = self.env_config.settings.backup
+        backup_config = self.backup_config
+
+        # Reuse a customer managed key shared across environments when configured, else the AWS managed key.
+        # The key can only be set when the vault is created; changing it needs a replacement the fixed name blocks.
+        encryption_key = (
+            kms.Key.from_key_arn(self, "BackupKey", backup_config.kms_key_arn) if backup_config.kms_key_arn else None
+        )
 
         # Create backup vault
         backup_vault = backup.BackupVault(
             self,
             "BackupVault",
             backup_vault_name=self.get_resource_name("backup-vault"),
-            encryption_key=None,  # Use default AWS managed key
+            encryption_key=encryption_key,
             removal_policy=self.removal_policy,
         )
 
@@ -150,7 +177,7 @@ class StorageStack(N8nBaseStack):
                 rule_name="DailyBackup",
                 schedule_expression=events.Schedule.cron(hour="3", minute="0"),
                 delete_after=Duration.days(backup_config.retention_days),
-                enable_continuous_backup=self.is_production(),
+                enable_continuous_backup=self._is_prod,
                 start_window=Duration.hours(1),
                 completion_window=Duration.hours(2),
             )
@@ -185,44 +212,41 @@ class StorageStack(N8nBaseStack):
             description="EFS file system ARN",
         )
 
-        self.add_output(
-            "AccessPointId",
-            value=self.n8n_access_point.access_point_id,
-            description="EFS access point ID for n8n",
-        )
-
-        self.add_output(
-            "AccessPointArn",
-            value=self.n8n_access_point.access_point_arn,
-            description="EFS access point ARN for n8n",
-        )
+        if self.n8n_access_point:
+            self.add_output(
+                "AccessPointId",
+                value=self.n8n_access_point.access_point_id,
+                description="EFS access point ID for n8n",
+            )
 
-        # Mount target info
-        mount_targets = []
-        for subnet in self.network_stack.subnets:
-            mount_targets.append(f"{self.file_system.file_system_id}.efs.{self.region}.amazonaws.com")
+            self.add_output(
+                "AccessPointArn",
+                value=self.n8n_access_point.access_point_arn,
+                description="EFS access point ARN for n8n",
+            )
 
+        # Every mount target resolves through the one regional file system DNS name
         self.add_output(
             "MountTargets",
-            value=Fn.join(",", mount_targets),
-            description="EFS mount targets",
+            value=Fn.sub(
+                "${FsId}.efs.${AWS::Region}.amazonaws.com",
+                {"FsId": self.file_system.file_system_id},
+            ),
+            description="EFS mount target DNS name",
         )
 
-    def get_efs_volume_configuration(self) -> dict:
-        """Get EFS volume configuration for Fargate task definition.
-
-        Returns:
-            Dictionary with EFS volume configuration
-        """
+    @cached_property
+    def efs_volume_configuration(self) -> dict:
+        """EFS volume configuration for a Fargate task definition, built on first access."""
+        authorization_config = {"iam": "ENABLED"}
+        if self.n8n_access_point:
+            authorization_config["access_point_id"] = self.n8n_access_point.access_point_id
         return {
             "name": "n8n-data",
             "efs_volume_configuration": {
                 "file_system_id": self.file_system.file_system_id,
                 "transit_encryption": "ENABLED",
-                "authorization_config": {
-                    "access_point_id": self.n8n_access_point.access_point_id,
-                    "iam": "ENABLED",
-                },
+                "authorization_config": authorization_config,
             },
         }
 
@@ -188,7 +188,8 @@ class TestStackDeployment:
             environment=environment,
             network_stack=network_stack,
             storage_stack=storage_stack,
-            database_endpoint=database_stack.endpoint if hasattr(database_stack, "endpoint") else None,
+            database_host=database_stack.endpoint_address,
+            database_port=database_stack.endpoint_port,
             database_secret=database_stack.secret if hasattr(database_stack, "secret") else None,
             env=env,
         )
@@ -407,7 +408,7 @@ class TestStackDeployment:
 
         for region in regions:
             environment = f"test-{region}"
-            config.environments[environment] = config.environments["test"].copy()
+            config.environments[environment] = config.environments["test"].model_copy()
             config.environments[environment].region = region
 
             env = Environment(account=config.environments[environment].account, region=region)
@@ -288,7 +288,7 @@ class TestIAMPolicies:
         )
 
         # Check EFS mount targets use encryption in transit
-        volume_config = storage_stack.get_efs_volume_configuration()
+        volume_config = storage_stack.efs_volume_configuration
         assert volume_config["efs_volume_configuration"]["transit_encryption"] == "ENABLED"
 
     def test_api_gateway_authentication(self, app, test_config):
@@ -430,7 +430,7 @@ class TestIAMPolicies:
     def test_vpc_endpoints_for_aws_services(self, app, test_config):
         """Test that VPC endpoints are used for AWS services when appropriate."""
         # This is particularly important for production environments
-        test_config.environments["production"] = test_config.environments["test"].copy()
+        test_config.environments["production"] = test_config.environments["test"].model_copy()
 
         network_stack = NetworkStack(
             app,
@@ -1,5 +1,8 @@
 """Pytest configuration and fixtures for unit tests."""
 
+import importlib.util
+import json
+from pathlib import Path
 from unittest.mock import MagicMock
 
 import pytest
@@ -193,7 +196,48 @@ def mock_database_stack(mock_secret):
     stack = MagicMock()
     stack.secret = mock_secret
     stack.endpoint = "test-db.cluster-12345.us-east-1.rds.amazonaws.com:5432"
+    stack.endpoint_address = "test-db.cluster-12345.us-east-1.rds.amazonaws.com"
+    stack.endpoint_port = "5432"
     stack.instance = MagicMock()
     stack.instance.db_instance_endpoint_address = "test-db.12345.us-east-1.rds.amazonaws.com"
     stack.instance.db_instance_endpoint_port = "5432"
     return stack
+
+
+HANDLERS_DIR = Path(__file__).parents[2] / "n8n_deploy" / "lambdas"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Mock boto3 client returned for every service a Lambda handler creates."""
+    mock_client = MagicMock()
+    monkeypatch.setattr("boto3.client", lambda *args, **kwargs: mock_client)
+    return mock_client
+
+
+@pytest.fixture
+def load_handler(client, monkeypatch):
+    """Load a fresh copy of a Lambda handler module under ``n8n_deploy/lambdas``.
+
+    Returns a function taking the handler directory name and the environment
+    variables to set before the module is executed.
+    """
+
+    # Bundling copies the shared modules next to each index.py
+    monkeypatch.syspath_prepend(str(HANDLERS_DIR / "shared"))
+
+    def load(name, env):
+        for key, value in env.items():
+            monkeypatch.setenv(key, value)
+        spec = importlib.util.spec_from_file_location(f"{name}_index", HANDLERS_DIR / name / "index.py")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    return load
+
+
+@pytest.fixture
+def emitted_metrics(capsys):
+    """Parse the Embedded Metric Format lines a handler printed so far."""
+    return lambda: [json.loads(line) for line in capsys.readouterr().out.splitlines()]
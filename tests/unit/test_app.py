@@ -0,0 +1,47 @@
+"""Unit tests for the CDK application entry point."""
+
+from aws_cdk import App
+
+from app import STACK_DEPENDENCIES, get_stack_filter
+
+ALL_STACKS = set(STACK_DEPENDENCIES)
+
+
+def selected_stacks(selectors):
+    """Return the stack keys the filter keeps for the given CLI selectors."""
+    app = App(context={"aws:cdk:bundling-stacks": selectors})
+    needs = get_stack_filter(app, "n8n-deploy-dev")
+    return {name for name in STACK_DEPENDENCIES if needs(name)}
+
+
+class TestGetStackFilter:
+    """Test stack selection from the CDK command line."""
+
+    def test_no_selectors_keeps_all_stacks(self):
+        """Test that an empty selector list (e.g. cdk synth) builds every stack."""
+        assert selected_stacks([]) == ALL_STACKS
+
+    def test_no_context_keeps_all_stacks(self):
+        """Test that a missing context key builds every stack."""
+        needs = get_stack_filter(App(), "n8n-deploy-dev")
+        assert all(needs(name) for name in STACK_DEPENDENCIES)
+
+    def test_wildcard_keeps_all_stacks(self):
+        """Test that --all (passed as **) builds every stack."""
+        assert selected_stacks(["**"]) == ALL_STACKS
+
+    def test_leaf_stack_keeps_its_upstream_stacks(self):
+        """Test that a leaf stack is built with everything it depends on."""
+        assert selected_stacks(["n8n-deploy-dev-access"]) == {"network", "storage", "database", "compute", "access"}
+
+    def test_root_stack_keeps_its_consumers(self):
+        """Test that a root stack keeps the consumers importing its exports."""
+        assert selected_stacks(["n8n-deploy-dev-network"]) == ALL_STACKS
+
+    def test_middle_stack_keeps_consumers_and_their_upstream_stacks(self):
+        """Test that consumers of a selected stack bring their own dependencies along."""
+        assert selected_stacks(["n8n-deploy-dev-compute"]) == ALL_STACKS
+
+    def test_other_environment_selects_nothing(self):
+        """Test that selectors for another environment skip every stack."""
+        assert selected_stacks(["n8n-deploy-prod-*"]) == set()
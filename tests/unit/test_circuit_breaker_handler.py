@@ -0,0 +1,109 @@
+"""Unit tests for the circuit breaker Lambda handler."""
+
+import pytest
+
+
+@pytest.fixture
+def circuit_breaker(load_handler, client):
+    """Load the handler with no circuit state stored."""
+    client.get_item.return_value = {}
+    return load_handler("circuit_breaker", {"CIRCUIT_STATE_TABLE": "circuit-state", "ENVIRONMENT": "test"})
+
+
+class TestCircuitBreakerHandler:
+    """Test circuit breaker handler."""
+
+    def test_check_closed_by_default(self, circuit_breaker, client):
+        """Test that an unknown service is allowed through."""
+        result = circuit_breaker.handler({"service_name": "api"}, None)
+
+        assert result == {"state": "closed", "allow_request": True}
+        client.get_item.assert_called_once_with(TableName="circuit-state", Key={"service_name": {"S": "api"}})
+
+    def test_check_open_circuit(self, circuit_breaker, client):
+        """Test that a recently opened circuit rejects requests."""
+        client.get_item.return_value = {
+            "Item": {"state": {"S": "open"}, "open_time": {"N": str(int(circuit_breaker.time.time()) - 60)}}
+        }
+
+        assert circuit_breaker.handler({"service_name": "api"}, None) == {"state": "open", "allow_request": False}
+        client.update_item.assert_not_called()
+
+    def test_check_half_open_after_timeout(self, circuit_breaker, client):
+        """Test that an open circuit moves to half-open after five minutes."""
+        client.get_item.return_value = {
+            "Item": {"state": {"S": "open"}, "open_time": {"N": str(int(circuit_breaker.time.time()) - 301)}}
+        }
+
+        assert circuit_breaker.handler({"service_name": "api"}, None) == {"state": "half-open", "allow_request": True}
+        assert client.update_item.call_args.kwargs["ExpressionAttributeValues"] == {":state": {"S": "half-open"}}
+
+    def test_check_legacy_open_time_goes_half_open(self, circuit_breaker, client):
+        """Test that rows with an ISO open_time from before epoch storage are treated as expired."""
+        client.get_item.return_value = {"Item": {"state": {"S": "open"}, "open_time": {"S": "2000-01-01T00:00:00"}}}
+
+        assert circuit_breaker.handler({"service_name": "api"}, None)["state"] == "half-open"
+
+    def test_check_result_is_cached(self, circuit_breaker, client):
+        """Test that repeated checks within the TTL read DynamoDB once."""
+        for _ in range(3):
+            circuit_breaker.handler({"service_name": "api"}, None)
+        assert client.get_item.call_count == 1
+
+        circuit_breaker.handler({"service_name": "other"}, None)
+        assert client.get_item.call_count == 2
+
+    def test_cache_expires(self, circuit_breaker, client, monkeypatch):
+        """Test that a check after the TTL reads DynamoDB again."""
+        circuit_breaker.handler({"service_name": "api"}, None)
+        monkeypatch.setattr(circuit_breaker, "_TTL", 0)
+        circuit_breaker.handler({"service_name": "api"}, None)
+
+        assert client.get_item.call_count == 2
+
+    def test_record_failure_opens_circuit(self, circuit_breaker, client, emitted_metrics):
+        """Test that reaching the failure threshold opens the circuit."""
+        circuit_breaker.handler({"service_name": "api"}, None)
+        result = circuit_breaker.handler({"service_name": "api", "action": "record_failure", "failure_count": 5}, None)
+
+        assert result["state"] == "open"
+        item = client.put_item.call_args.kwargs["Item"]
+        assert item["state"] == {"S": "open"}
+        assert item["failure_count"] == {"N": "5"}
+        assert int(item["ttl"]["N"]) == int(item["open_time"]["N"]) + 24 * 60 * 60
+        (metric,) = emitted_metrics()
+        assert metric["CircuitOpened"] == 1
+        assert metric["ServiceName"] == "api"
+        assert metric["_aws"]["CloudWatchMetrics"][0]["Namespace"] == "N8n/CircuitBreaker"
+        assert "api" not in circuit_breaker._CACHE
+
+    def test_record_failure_below_threshold(self, circuit_breaker, client):
+        """Test that failures below the threshold keep the circuit closed."""
+        result = circuit_breaker.handler({"service_name": "api", "action": "record_failure", "failure_count": 2}, None)
+
+        assert result == {"state": "closed", "failure_count": 2}
+        client.put_item.assert_not_called()
+
+    def test_record_success_closes_circuit(self, circuit_breaker, client):
+        """Test that a success closes the circuit and invalidates the cache."""
+        circuit_breaker.handler({"service_name": "api"}, None)
+        result = circuit_breaker.handler({"service_name": "api", "action": "record_success"}, None)
+
+        assert result["state"] == "closed"
+        assert client.update_item.call_args.kwargs["ExpressionAttributeValues"] == {
+            ":state": {"S": "closed"},
+            ":count": {"N": "0"},
+        }
+        circuit_breaker.handler({"service_name": "api"}, None)
+        assert client.get_item.call_count == 2
+
+    def test_warmup(self, circuit_breaker, client):
+        """Test that the keep-warm ping touches no state."""
+        assert circuit_breaker.handler({"action": "warmup"}, None) == {"status": "warm"}
+
+        client.get_item.assert_not_called()
+        client.update_item.assert_not_called()
+
+    def test_invalid_action(self, circuit_breaker):
+        """Test that unknown actions are rejected."""
+        assert circuit_breaker.handler({"service_name": "api", "action": "bogus"}, None) == {"error": "Invalid action"}
@@ -1,5 +1,7 @@
 """Unit tests for Cloudflare Tunnel configuration and constructs."""
 
+import json
+
 import aws_cdk.aws_ec2 as ec2
 import aws_cdk.aws_ecs as ecs
 import aws_cdk.aws_logs as logs
@@ -74,6 +76,12 @@ class TestCloudflareConfig:
             "exam ple.com",  # Contains space
             "example.com/path",  # Contains path
             "https://example.com",  # Contains protocol
+            "example.com\n",  # Trailing newline
+            "under_score.example.com",  # Underscore is not valid in a hostname label
+            "a" * 64 + ".com",  # Label longer than 63 characters
+            ("a" * 62 + ".") * 5 + "com",  # Longer than 253 characters
+            "a" * 64 + "!",  # Pathological input for backtracking patterns
+            "exämple.com",  # Non-ASCII (IDNs must be punycode-encoded)
         ]
 
         for domain in invalid_domains:
@@ -115,6 +123,26 @@ class TestAccessConfig:
         assert config.cloudflare is not None
         assert config.cloudflare.enabled is True
 
+    def test_cors_origins_validation(self):
+        """Test CORS origin format validation."""
+        config = AccessConfig(
+            cors_origins=["*", "https://app.example.com", "http://localhost:3000", "https://*.example.com"]
+        )
+        assert len(config.cors_origins) == 4
+
+        for origin in ["app.example.com", "https://example.com/path", "ftp://example.com"]:
+            with pytest.raises(ValueError, match="Invalid CORS origins"):
+                AccessConfig(cors_origins=[origin])
+
+    def test_ip_whitelist_validation(self):
+        """Test IP whitelist CIDR validation."""
+        config = AccessConfig(ip_whitelist=["1.2.3.4/32", "10.0.0.0/8"])
+        assert config.ip_whitelist == ["1.2.3.4/32", "10.0.0.0/8"]
+
+        for cidr in ["1.2.3.4", "256.1.1.1/32", "1.2.3.4/33", "2001:db8::/32"]:
+            with pytest.raises(ValueError, match="Invalid IP whitelist entries"):
+                AccessConfig(ip_whitelist=[cidr])
+
 
 class TestCloudflareTunnelConfiguration:
     """Test Cloudflare Tunnel Configuration construct."""
@@ -146,6 +174,18 @@ class TestCloudflareTunnelConfiguration:
         assert config.tunnel_domain == "test.example.com"
         assert config.service_url == "http://localhost:5678"
 
+        origin_request = config.tunnel_config["ingress"][0]["originRequest"]
+        assert origin_request["noTLSVerify"] is True
+        assert origin_request["keepAliveTimeout"] == "90s"
+        assert origin_request["httpHostHeader"] == "test.example.com"
+        assert "httpHostHeader" not in CloudflareTunnelConfiguration._ORIGIN_REQUEST_DEFAULTS
+        assert config.tunnel_config["ingress"][-1] == {"service": "http_status:404"}
+
+        # The config is shaped like a cloudflared config file, so it must serialize and stay editable
+        assert json.loads(json.dumps(config.tunnel_config)) == config.tunnel_config
+        config.tunnel_config["ingress"][-1]["service"] = "http_status:403"
+        assert CloudflareTunnelConfiguration._CATCH_ALL["service"] == "http_status:404"
+
     def test_configuration_creates_new_secret(self):
         """Test configuration creates new secret when not provided."""
         CloudflareTunnelConfiguration(
@@ -187,6 +227,14 @@ class TestCloudflareTunnelConfiguration:
         assert config.access_config["enabled"] is True
         assert len(config.tunnel_config["ingress"][0]["originRequest"].get("access", {}).get("policies", [])) > 0
 
+        policies = config.tunnel_config["ingress"][0]["originRequest"]["access"]["policies"]
+        assert policies == [
+            {"type": "email", "email": {"email": "admin@example.com"}},
+            {"type": "email", "email": {"email": "user@example.com"}},
+            {"type": "email_domain", "email_domain": {"domain": "example.com"}},
+            {"type": "email_domain", "email_domain": {"domain": "company.com"}},
+        ]
+
 
 class TestCloudflareTunnelSidecar:
     """Test Cloudflare Tunnel Sidecar construct."""
@@ -274,14 +274,16 @@ class TestComputeStack:
                 environment="test",
                 network_stack=network_stack_mock,
                 storage_stack=storage_stack_mock,
-                database_endpoint="test-db.cluster-xxx.us-east-1.rds.amazonaws.com",
+                database_host="test-db.cluster-xxx.us-east-1.rds.amazonaws.com",
+                database_port="5432",
                 database_secret=mock_secret,
                 env=Environment(account="123456789012", region="us-east-1"),
             )
 
             # Verify database parameters were passed
             call_args = mock_fargate.call_args[1]
-            assert call_args["database_endpoint"] == "test-db.cluster-xxx.us-east-1.rds.amazonaws.com"
+            assert call_args["database_host"] == "test-db.cluster-xxx.us-east-1.rds.amazonaws.com"
+            assert call_args["database_port"] == "5432"
             assert call_args["database_secret"] == mock_secret
 
     def test_stack_outputs(self, app, test_config, network_stack_mock, storage_stack_mock):
@@ -1,10 +1,23 @@
 """Unit tests for configuration loader."""
 
+import json
+import os
+
 import pytest
 import yaml
 
 from n8n_deploy.config.config_loader import ConfigLoader
-from n8n_deploy.config.models import DatabaseType, N8nConfig
+from n8n_deploy.config.models import (
+    AuthConfig,
+    BackupConfig,
+    DatabaseType,
+    DefaultsConfig,
+    EnvironmentSettings,
+    FargateConfig,
+    N8nConfig,
+    NetworkingConfig,
+    ScalingConfig,
+)
 
 
 class TestConfigLoader:
@@ -100,6 +113,103 @@ class TestConfigLoader:
         with pytest.raises(ValueError, match="Invalid CPU/memory combination"):
             loader.load_config("test")
 
+    def test_cross_field_validation_covers_defaults(self):
+        """Test cross-field checks also apply when the dependent field is left at its default."""
+        with pytest.raises(ValueError, match="Invalid CPU/memory combination"):
+            FargateConfig(cpu=1024)
+        with pytest.raises(ValueError, match="max_tasks.*must be.*min_tasks"):
+            ScalingConfig(min_tasks=3)
+        with pytest.raises(ValueError, match="vpc_id required"):
+            NetworkingConfig(use_existing_vpc=True)
+        with pytest.raises(ValueError, match="oauth_provider required"):
+            AuthConfig(oauth_enabled=True)
+
+    def test_efs_throughput_mode_validation(self):
+        """Test EFS throughput mode values and the provisioned throughput requirement."""
+        assert DefaultsConfig(efs={"lifecycle_days": 30}).efs == {"lifecycle_days": 30}
+        assert DefaultsConfig(efs={"throughput_mode": "bursting"}).efs["throughput_mode"] == "bursting"
+        DefaultsConfig(efs={"throughput_mode": "provisioned", "provisioned_throughput_mibps": 128})
+
+        with pytest.raises(ValueError, match="Invalid EFS throughput_mode"):
+            DefaultsConfig(efs={"throughput_mode": "max_io"})
+        with pytest.raises(ValueError, match="provisioned_throughput_mibps is required"):
+            DefaultsConfig(efs={"throughput_mode": "provisioned"})
+
+    def test_efs_root_mount_requires_prepared_root(self):
+        """Test that mounting the EFS root must be confirmed once the root is owned by n8n."""
+        with pytest.raises(ValueError, match="root_owned_by_n8n"):
+            DefaultsConfig(efs={"use_access_point": False})
+
+        efs_config = DefaultsConfig(efs={"use_access_point": False, "root_owned_by_n8n": True}).efs
+        assert efs_config["use_access_point"] is False
+
+    def test_backup_kms_key_arn_validation(self):
+        """Test the backup vault key must be a KMS key ARN."""
+        arn = "arn:aws:kms:us-east-1:123456789012:key/1234abcd-12ab-34cd-56ef-1234567890ab"
+        assert BackupConfig(kms_key_arn=arn).kms_key_arn == arn
+        assert BackupConfig().kms_key_arn is None
+
+        with pytest.raises(ValueError, match="Invalid kms_key_arn"):
+            BackupConfig(kms_key_arn="arn:aws:kms:us-east-1:123456789012:alias/backup")
+
+    def test_load_from_mapping_and_json(self):
+        """Test the root model validates both parsed mappings and JSON documents."""
+        data = {
+            "global": {"project_name": "test", "organization": "test"},
+            "environments": {
+                "dev": {"account": "123456789012", "region": "us-east-1", "settings": {"fargate": {"cpu": 256}}}
+            },
+        }
+
+        from_mapping = N8nConfig.load(data)
+        from_json = N8nConfig.load(json.dumps(data).encode())
+
+        assert isinstance(from_mapping, N8nConfig)
+        assert from_json == from_mapping
+        assert from_json.environments["dev"].settings.fargate.memory == 512
+
+    def test_load_from_dict(self):
+        """Test loading an environment from a parsed mapping without a config file."""
+        data = {
+            "global": {"project_name": "test", "organization": "test"},
+            "environments": {"dev": {"account": "123456789012", "region": "us-east-1", "settings": {}}},
+        }
+
+        config = ConfigLoader("missing.yaml").load_from_dict(data, environment="dev")
+
+        assert list(config.environments) == ["dev"]
+        assert config.global_config.project_name == "test"
+        with pytest.raises(ValueError, match="Environment 'prod' not found"):
+            ConfigLoader().load_from_dict(data, environment="prod")
+        with pytest.raises(ValueError, match="Configuration validation failed"):
+            ConfigLoader().load_from_dict({"environments": {}}, environment="dev")
+
+    def test_features_keep_dict_access(self):
+        """Test feature flags validate known keys and pass unknown ones through as a dict."""
+        settings = EnvironmentSettings(features={"webhooks_enabled": True, "external_api_access": True})
+        assert settings.features.get("webhooks_enabled") is True
+        assert settings.features["external_api_access"] is True
+
+        with pytest.raises(ValueError, match="components"):
+            EnvironmentSettings(features={"components": "fargate"})
+
+    def test_from_yaml(self, tmp_path):
+        """Test the root model can parse and validate a YAML file directly."""
+        config_file = tmp_path / "system.yaml"
+        config_file.write_text(
+            yaml.dump(
+                {
+                    "global": {"project_name": "test", "organization": "test"},
+                    "environments": {"dev": {"account": "123456789012", "region": "us-east-1", "settings": {}}},
+                }
+            )
+        )
+
+        config = N8nConfig.from_yaml(config_file)
+
+        assert config.global_config.project_name == "test"
+        assert config.get_environment("dev").region == "us-east-1"
+
     def test_merge_with_defaults(self, tmp_path):
         """Test merging environment config with defaults."""
         config_data = {
@@ -138,6 +248,12 @@ class TestConfigLoader:
         assert env_config.settings.fargate.memory == 512  # Override
         # Note: The current implementation doesn't deep merge, so we'd need to enhance it
 
+        # Missing sections fall back to defaults without touching the base environment
+        assert env_config.settings.monitoring.log_retention_days == 30
+        base_env = loader._config.environments["test"]
+        assert base_env.settings.monitoring is None
+        assert env_config.settings.fargate is base_env.settings.fargate
+
     def test_stack_type_application(self, tmp_path):
         """Test applying stack type configuration."""
         config_data = {
@@ -176,6 +292,9 @@ class TestConfigLoader:
             "efs",
             "api_gateway",
         ]
+        # Stack settings are validated into models, not left as raw dicts
+        assert isinstance(env_config.settings.fargate, FargateConfig)
+        assert env_config.settings.fargate.memory == 512
 
     def test_database_configuration(self, tmp_path):
         """Test database configuration validation."""
@@ -291,3 +410,247 @@ class TestConfigLoader:
         loader = ConfigLoader(str(invalid_file))
         with pytest.raises(ValueError):
             loader.validate_config_file()
+
+    def test_raw_config_cache(self, tmp_path):
+        """Test parsed YAML is reused across loaders until the file changes."""
+        config_data = {
+            "global": {
+                "project_name": "test",
+                "organization": "test",
+            },
+            "environments": {
+                "dev": {
+                    "account": "123456789012",
+                    "region": "us-east-1",
+                    "settings": {},
+                }
+            },
+        }
+
+        config_file = tmp_path / "system.yaml"
+        with open(config_file, "w") as f:
+            yaml.dump(config_data, f)
+
+        ConfigLoader.clear_cache()
+        first = ConfigLoader(str(config_file))
+        first._load_raw_config()
+        second = ConfigLoader(str(config_file))
+        second._load_raw_config()
+        assert second._raw_config is first._raw_config
+
+        # The loader releases the raw dict once the models are validated
+        second._validate_config()
+        assert second._raw_config is None
+
+        # Rewriting the file changes its size, which invalidates the entry
+        config_data["environments"]["staging"] = config_data["environments"]["dev"]
+        with open(config_file, "w") as f:
+            yaml.dump(config_data, f)
+
+        third = ConfigLoader(str(config_file))
+        assert third.get_available_environments() == ["dev", "staging"]
+        ConfigLoader.clear_cache()
+
+    def test_json_shadow_cache(self, tmp_path, monkeypatch):
+        """Test the opt-in JSON shadow of system.yaml is written and preferred."""
+        config_data = {
+            "global": {
+                "project_name": "test",
+                "organization": "test",
+            },
+            "environments": {
+                "dev": {
+                    "account": "123456789012",
+                    "region": "us-east-1",
+                    "settings": {},
+                }
+            },
+        }
+
+        config_file = tmp_path / "system.yaml"
+        with open(config_file, "w") as f:
+            yaml.dump(config_data, f)
+
+        monkeypatch.setenv("N8N_DEPLOY_YAML_CACHE", "1")
+        ConfigLoader.clear_cache()
+        ConfigLoader(str(config_file)).validate_config_file()
+
+        shadow_file = tmp_path / ".system.yaml.cache.json"
+        assert shadow_file.exists()
+
+        # A fresh process-level cache should read the shadow instead of the YAML
+        shadow = json.loads(shadow_file.read_text())
+        shadow["config"]["environments"]["shadow"] = config_data["environments"]["dev"]
+        shadow_file.write_text(json.dumps(shadow))
+        ConfigLoader.clear_cache()
+        assert "shadow" in ConfigLoader(str(config_file)).get_available_environments()
+
+        # A YAML restored with an older mtime is not answered from the newer shadow
+        config_data["environments"]["restored"] = config_data["environments"]["dev"]
+        with open(config_file, "w") as f:
+            yaml.dump(config_data, f)
+        os.utime(config_file, ns=(0, 0))
+        ConfigLoader.clear_cache()
+        assert ConfigLoader(str(config_file)).get_available_environments() == ["dev", "restored"]
+        ConfigLoader.clear_cache()
+
+    def test_json_shadow_cache_skips_non_string_keys(self, tmp_path, monkeypatch):
+        """Test that no shadow is written when JSON would change the parsed YAML."""
+        config_file = tmp_path / "system.yaml"
+        config_file.write_text(
+            "global:\n  project_name: test\n  organization: test\n"
+            "environments:\n  dev:\n    account: '123456789012'\n    region: us-east-1\n"
+            "    settings:\n      features:\n        1: numeric\n"
+        )
+
+        monkeypatch.setenv("N8N_DEPLOY_YAML_CACHE", "1")
+        ConfigLoader.clear_cache()
+        ConfigLoader(str(config_file))._load_raw_config()
+        assert not (tmp_path / ".system.yaml.cache.json").exists()
+        ConfigLoader.clear_cache()
+
+    def test_stack_type_does_not_mutate_base_config(self, tmp_path):
+        """Test applying a stack type leaves the loaded environment untouched."""
+        config_data = {
+            "global": {
+                "project_name": "test",
+                "organization": "test",
+            },
+            "environments": {
+                "test": {
+                    "account": "123456789012",
+                    "region": "us-east-1",
+                    "settings": {"features": {"webhooks_enabled": True}},
+                }
+            },
+            "stacks": {
+                "minimal": {
+                    "description": "Minimal setup",
+                    "components": ["fargate", "efs"],
+                }
+            },
+        }
+
+        config_file = tmp_path / "system.yaml"
+        with open(config_file, "w") as f:
+            yaml.dump(config_data, f)
+
+        loader = ConfigLoader(str(config_file))
+        config = loader.load_config("test", stack_type="minimal")
+
+        features = config.get_environment("test").settings.features
+        assert features == {"webhooks_enabled": True, "components": ["fargate", "efs"]}
+        assert loader._config.get_environment("test").settings.features == {"webhooks_enabled": True}
+
+    def test_config_found_in_parent_directory(self, tmp_path, monkeypatch):
+        """Test the config file is looked up in parent directories."""
+        config_data = {
+            "global": {
+                "project_name": "test",
+                "organization": "test",
+            },
+            "environments": {
+                "dev": {
+                    "account": "123456789012",
+                    "region": "us-east-1",
+                    "settings": {},
+                }
+            },
+        }
+
+        with open(tmp_path / "parent-system.yaml", "w") as f:
+            yaml.dump(config_data, f)
+        nested = tmp_path / "a" / "b"
+        nested.mkdir(parents=True)
+        monkeypatch.chdir(nested)
+
+        ConfigLoader.clear_cache()
+        loader = ConfigLoader("parent-system.yaml")
+        assert loader.get_available_environments() == ["dev"]
+        assert loader.config_file == tmp_path / "parent-system.yaml"
+        ConfigLoader.clear_cache()
+
+    def test_pickle_cache(self, tmp_path, monkeypatch):
+        """Test the opt-in pickle cache stores and reuses the validated config."""
+        config_data = {
+            "global": {
+                "project_name": "test",
+                "organization": "test",
+            },
+            "environments": {
+                "dev": {
+                    "account": "123456789012",
+                    "region": "us-east-1",
+                    "settings": {"fargate": {"cpu": 512, "memory": 1024}},
+                }
+            },
+        }
+
+        config_file = tmp_path / "system.yaml"
+        with open(config_file, "w") as f:
+            yaml.dump(config_data, f)
+
+        monkeypatch.setenv("N8N_DEPLOY_PICKLE_CACHE", "1")
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+
+        first = ConfigLoader(str(config_file))
+        first.validate_config_file()
+        assert len(list((tmp_path / "cache" / "n8n_deploy").glob("*.pkl"))) == 1
+
+        second = ConfigLoader(str(config_file))
+        config = second.load_config("dev")
+        assert second._config is not first._config
+        assert config.get_environment("dev").settings.fargate.memory == 1024
+
+    def test_runtime_overrides(self, tmp_path):
+        """Test runtime overrides only touch declared settings fields."""
+        config_data = {
+            "global": {
+                "project_name": "test",
+                "organization": "test",
+            },
+            "environments": {
+                "test": {
+                    "account": "123456789012",
+                    "region": "us-east-1",
+                    "settings": {"scaling": {"min_tasks": 1, "max_tasks": 1}},
+                }
+            },
+        }
+
+        config_file = tmp_path / "system.yaml"
+        with open(config_file, "w") as f:
+            yaml.dump(config_data, f)
+
+        loader = ConfigLoader(str(config_file))
+        config = loader.load_config(
+            "test",
+            overrides={"scaling": {"min_tasks": 2, "max_tasks": 4}, "model_dump": None, "unknown": True},
+        )
+
+        settings = config.get_environment("test").settings
+        assert settings.scaling.max_tasks == 4
+        assert callable(settings.model_dump)
+        assert not hasattr(settings, "unknown")
+
+    def test_peek_environments(self, tmp_path):
+        """Test environment names can be listed without validating the config."""
+        config_data = {
+            "global": {
+                "project_name": "test"
+                # Missing organization, so full validation would fail
+            },
+            "environments": {
+                "dev": {"account": "123456789012", "region": "us-east-1", "settings": {}},
+                "prod": {"account": "123456789013", "region": "us-east-1", "settings": {}},
+            },
+        }
+
+        config_file = tmp_path / "system.yaml"
+        with open(config_file, "w") as f:
+            yaml.dump(config_data, f, sort_keys=False)
+
+        loader = ConfigLoader(str(config_file))
+        assert loader.peek_environments() == ["dev", "prod"]
+        with pytest.raises(ValueError):
+            loader.get_available_environments()
@@ -0,0 +1,97 @@
+"""Unit tests for the health check Lambda handler."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+
+@pytest.fixture
+def health_check(load_handler, client):
+    """Load the handler with one running task and a mocked HTTP connection."""
+    client.describe_services.return_value = {"services": [{"runningCount": 1, "desiredCount": 1}]}
+    module = load_handler(
+        "health_check",
+        {
+            "CLUSTER_NAME": "cluster",
+            "SERVICE_NAME": "n8n",
+            "HEALTH_URL": "http://n8n.n8n-test.local:5678/healthz",
+            "SNS_TOPIC_ARN": "arn:aws:sns:us-east-1:123456789012:alerts",
+            "ENVIRONMENT": "test",
+        },
+    )
+
+    connection = MagicMock()
+    connection.getresponse.return_value.status = 200
+    module.HTTPConnection = MagicMock(return_value=connection)
+    return module
+
+
+class TestHealthCheckHandler:
+    """Test health check handler."""
+
+    def test_healthy_service(self, health_check, client, emitted_metrics):
+        """Test a fully running service with a passing endpoint."""
+        assert health_check.handler({}, None) == {"status": "healthy", "running_tasks": 1}
+
+        health_check.HTTPConnection.assert_called_once_with("n8n.n8n-test.local", 5678, timeout=10)
+        connection = health_check.HTTPConnection.return_value
+        connection.request.assert_called_once_with("GET", "/healthz")
+        connection.close.assert_called_once()
+        assert emitted_metrics() == []
+
+    def test_failing_endpoint(self, health_check, client, emitted_metrics):
+        """Test that a non-200 response is reported as unhealthy."""
+        health_check.HTTPConnection.return_value.getresponse.return_value.status = 503
+
+        result = health_check.handler({}, None)
+
+        assert result["status"] == "unhealthy"
+        assert "503" in result["error"]
+        (metric,) = emitted_metrics()
+        assert metric["HealthCheckFailed"] == 1
+        assert metric["_aws"]["CloudWatchMetrics"][0]["Namespace"] == "N8n/Health"
+
+    def test_degraded_service_sends_metrics_together(self, health_check, client, emitted_metrics):
+        """Test that both failure metrics go out in a single log line."""
+        client.describe_services.return_value = {"services": [{"runningCount": 1, "desiredCount": 2}]}
+        health_check.HTTPConnection.return_value.request.side_effect = OSError("connection refused")
+
+        assert health_check.handler({}, None)["status"] == "unhealthy"
+
+        client.publish.assert_called_once()
+        (metric,) = emitted_metrics()
+        assert [m["Name"] for m in metric["_aws"]["CloudWatchMetrics"][0]["Metrics"]] == [
+            "ServiceUnhealthy",
+            "HealthCheckFailed",
+        ]
+        assert metric["ServiceUnhealthy"] == metric["HealthCheckFailed"] == 1
+
+    def test_recovery_when_no_tasks_running(self, health_check, client, emitted_metrics):
+        """Test that a service with no running tasks is flagged for the recovery alarm."""
+        client.describe_services.return_value = {"services": [{"runningCount": 0, "desiredCount": 1}]}
+
+        assert health_check.handler({}, None)["status"] == "recovery_requested"
+
+        (metric,) = emitted_metrics()
+        assert metric["NoRunningTasks"] == 1
+        client.update_service.assert_not_called()
+        health_check.HTTPConnection.assert_not_called()
+
+    def test_task_counts_only_without_health_url(self, load_handler, client, emitted_metrics):
+        """Test that the HTTP probe is skipped when the function runs outside the VPC."""
+        client.describe_services.return_value = {"services": [{"runningCount": 1, "desiredCount": 1}]}
+        health_check = load_handler(
+            "health_check",
+            {
+                "CLUSTER_NAME": "cluster",
+                "SERVICE_NAME": "n8n",
+                "SNS_TOPIC_ARN": "arn:aws:sns:us-east-1:123456789012:alerts",
+                "ENVIRONMENT": "test",
+            },
+        )
+        health_check.HTTPConnection = MagicMock()
+
+        assert health_check.handler({}, None) == {"status": "healthy", "running_tasks": 1}
+
+        health_check.HTTPConnection.assert_not_called()
+        assert emitted_metrics() == []
@@ -1,22 +1,27 @@
 """Unit tests for MonitoringStack."""
 
+import json
 from unittest.mock import Mock
 
 import pytest
 from aws_cdk import App, Environment
+from aws_cdk import aws_efs as efs
 from aws_cdk.assertions import Match, Template
 
 from n8n_deploy.config.models import (
+    DefaultsConfig,
     EnvironmentConfig,
     EnvironmentSettings,
     GlobalConfig,
     MonitoringConfig,
     N8nConfig,
+    NetworkingConfig,
     ScalingConfig,
 )
 from n8n_deploy.stacks.compute_stack import ComputeStack
 from n8n_deploy.stacks.database_stack import DatabaseStack
 from n8n_deploy.stacks.monitoring_stack import MonitoringStack
+from n8n_deploy.stacks.network_stack import NetworkStack
 from n8n_deploy.stacks.storage_stack import StorageStack
 
 
@@ -74,6 +79,7 @@ class TestMonitoringStack:
         """Create mock storage stack."""
         stack = Mock(spec=StorageStack)
         stack.file_system = efs_file_system_mock
+        stack.throughput_mode = efs.ThroughputMode.BURSTING
         return stack
 
     @pytest.fixture
@@ -192,35 +198,6 @@ class TestMonitoringStack:
             },
         )
 
-    def test_storage_alarms_creation(self, app, test_config, compute_stack_mock, storage_stack_mock):
-        """Test creation of storage resource alarms."""
-        storage_stack_mock.file_system.file_system_id = "fs-12345678"
-
-        stack = MonitoringStack(
-            app,
-            "TestMonitoringStack",
-            config=test_config,
-            environment="test",
-            compute_stack=compute_stack_mock,
-            storage_stack=storage_stack_mock,
-            env=Environment(account="123456789012", region="us-east-1"),
-        )
-
-        template = Template.from_stack(stack)
-
-        # Verify EFS burst credit alarm
-        template.has_resource_properties(
-            "AWS::CloudWatch::Alarm",
-            {
-                "AlarmName": Match.string_like_regexp(".*efs-burst-credits-low"),
-                "AlarmDescription": "EFS burst credits are running low",
-                "MetricName": "BurstCreditBalance",
-                "Namespace": "AWS/EFS",
-                "Threshold": 1000000000000,  # 1 TB
-                "ComparisonOperator": "LessThanThreshold",
-            },
-        )
-
     def test_database_alarms_creation(self, app, test_config, compute_stack_mock, database_stack_mock):
         """Test creation of database resource alarms."""
         stack = MonitoringStack(
@@ -561,3 +538,105 @@ class TestMonitoringStack:
         assert "Performance Metrics" in dashboard_body
         assert "Authentication Errors" in dashboard_body
         assert "Workflow Success Rate" in dashboard_body
+
+
+def build_monitoring_stack(efs_config):
+    """Build a monitoring stack over real network, storage and compute stacks.
+
+    Args:
+        efs_config: ``defaults.efs`` settings
+
+    Returns:
+        MonitoringStack in a fresh app
+    """
+    config = N8nConfig(
+        global_config=GlobalConfig(project_name="test-n8n", organization="test-org"),
+        defaults=DefaultsConfig(efs=efs_config),
+        environments={
+            "test": EnvironmentConfig(
+                account="123456789012",
+                region="us-east-1",
+                settings=EnvironmentSettings(
+                    networking=NetworkingConfig(use_existing_vpc=False, vpc_cidr="10.0.0.0/16"),
+                    monitoring=MonitoringConfig(alarm_email="alerts@example.com"),
+                ),
+            )
+        },
+    )
+    app = App()
+    env = Environment(account="123456789012", region="us-east-1")
+    network_stack = NetworkStack(app, "TestNetworkStack", config=config, environment="test", env=env)
+    storage_stack = StorageStack(
+        app, "TestStorageStack", config=config, environment="test", network_stack=network_stack, env=env
+    )
+    compute_stack = ComputeStack(
+        app,
+        "TestComputeStack",
+        config=config,
+        environment="test",
+        network_stack=network_stack,
+        storage_stack=storage_stack,
+        env=env,
+    )
+    return MonitoringStack(
+        app,
+        "TestMonitoringStack",
+        config=config,
+        environment="test",
+        compute_stack=compute_stack,
+        storage_stack=storage_stack,
+        env=env,
+    )
+
+
+class TestStorageAlarms:
+    """Test the EFS alarms against a synthesized storage stack."""
+
+    def test_bursting_file_system_alarms(self):
+        """Test that a bursting file system gets burst credit and I/O limit alarms."""
+        template = Template.from_stack(build_monitoring_stack({"throughput_mode": "bursting"}))
+
+        template.has_resource_properties(
+            "AWS::CloudWatch::Alarm",
+            {
+                "AlarmName": Match.string_like_regexp(".*efs-burst-credits-low"),
+                "AlarmDescription": "EFS burst credits are running low",
+                "MetricName": "BurstCreditBalance",
+                "Namespace": "AWS/EFS",
+                "Period": 600,
+                "Threshold": 192416666667,
+                "ComparisonOperator": "LessThanThreshold",
+            },
+        )
+        template.has_resource_properties(
+            "AWS::CloudWatch::Alarm",
+            {
+                "AlarmName": Match.string_like_regexp(".*efs-io-limit-high"),
+                "MetricName": "PercentIOLimit",
+                "Namespace": "AWS/EFS",
+                "Period": 600,
+                "Threshold": 80,
+                "ComparisonOperator": "GreaterThanThreshold",
+            },
+        )
+
+    @pytest.mark.parametrize(
+        "efs_config",
+        [{"throughput_mode": "elastic"}, {"throughput_mode": "provisioned", "provisioned_throughput_mibps": 64}],
+    )
+    def test_no_burst_alarms_without_bursting(self, efs_config):
+        """Test that elastic and provisioned file systems get no burst alarms or burst credit graph."""
+        template = Template.from_stack(build_monitoring_stack(efs_config))
+
+        assert not template.find_resources("AWS::CloudWatch::Alarm", {"Properties": {"Namespace": "AWS/EFS"}})
+        dashboard_body = json.dumps(template.find_resources("AWS::CloudWatch::Dashboard"))
+        assert "BurstCreditBalance" not in dashboard_body
+        assert "MeteredIOBytes" in dashboard_body
+
+    def test_bursting_dashboard_graphs_burst_credits(self):
+        """Test that a bursting file system graphs its burst credits."""
+        template = Template.from_stack(build_monitoring_stack({"throughput_mode": "bursting"}))
+
+        dashboard_body = json.dumps(template.find_resources("AWS::CloudWatch::Dashboard"))
+        assert "BurstCreditBalance" in dashboard_body
+        assert "MeteredIOBytes" not in dashboard_body
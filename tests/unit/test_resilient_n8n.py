@@ -0,0 +1,181 @@
+"""Unit tests for the ResilientN8n construct."""
+
+import copy
+import json
+
+import pytest
+from aws_cdk import App, Environment
+from aws_cdk.assertions import Match, Template
+
+from n8n_deploy.config import ConfigLoader
+from n8n_deploy.stacks.compute_stack import ComputeStack
+from n8n_deploy.stacks.network_stack import NetworkStack
+from n8n_deploy.stacks.storage_stack import StorageStack
+
+RESILIENCE_CONFIG = {
+    "global": {"project_name": "n8n-deploy", "organization": "test-org"},
+    "environments": {
+        "test": {
+            "account": "123456789012",
+            "region": "us-east-1",
+            "settings": {
+                "fargate": {"cpu": 256, "memory": 512},
+                "networking": {"use_existing_vpc": False, "vpc_cidr": "10.0.0.0/16"},
+                "features": {"resilience_enabled": True},
+            },
+        }
+    },
+}
+
+RESILIENCE_FUNCTIONS = ("circuit-breaker", "retry-handler", "health-check")
+
+
+def synth_compute_stack(**settings):
+    """Synthesize the compute stack with resilience enabled, without bundling the Lambda assets."""
+    config_dict = copy.deepcopy(RESILIENCE_CONFIG)
+    config_dict["environments"]["test"]["settings"].update(settings)
+    config = ConfigLoader().load_from_dict(config_dict, environment="test")
+    env = Environment(account="123456789012", region="us-east-1")
+    app = App(context={"aws:cdk:bundling-stacks": []})
+
+    network_stack = NetworkStack(app, "TestNetworkStack", config=config, environment="test", env=env)
+    storage_stack = StorageStack(
+        app,
+        "TestStorageStack",
+        config=config,
+        environment="test",
+        network_stack=network_stack,
+        env=env,
+    )
+    compute_stack = ComputeStack(
+        app,
+        "TestComputeStack",
+        config=config,
+        environment="test",
+        network_stack=network_stack,
+        storage_stack=storage_stack,
+        env=env,
+    )
+    return Template.from_stack(compute_stack)
+
+
+class TestResilientN8n:
+    """Test the synthesized resilience resources."""
+
+    @pytest.fixture(scope="class")
+    def template(self):
+        """Synthesize the default public-subnet deployment once."""
+        return synth_compute_stack()
+
+    @pytest.mark.parametrize("name", RESILIENCE_FUNCTIONS)
+    def test_functions_use_snapstart_on_arm64(self, template, name):
+        """Test that every resilience function runs Python 3.13 on arm64 with SnapStart."""
+        template.has_resource_properties(
+            "AWS::Lambda::Function",
+            {
+                "FunctionName": f"n8n-test-{name}",
+                "Runtime": "python3.13",
+                "Architectures": ["arm64"],
+                "SnapStart": {"ApplyOn": "PublishedVersions"},
+            },
+        )
+
+    def test_functions_are_invoked_through_live_aliases(self, template):
+        """Test that each function gets a live alias, since SnapStart skips $LATEST."""
+        template.resource_properties_count_is("AWS::Lambda::Alias", {"Name": "live"}, len(RESILIENCE_FUNCTIONS))
+
+    def test_health_check_stays_outside_vpc_without_nat(self, template):
+        """Test that the health check keeps its route to the ECS and SNS APIs when there is no NAT."""
+        health_check = template.find_resources(
+            "AWS::Lambda::Function", {"Properties": {"FunctionName": "n8n-test-health-check"}}
+        )
+        (properties,) = [resource["Properties"] for resource in health_check.values()]
+        assert "VpcConfig" not in properties
+        assert "HEALTH_URL" not in properties["Environment"]["Variables"]
+
+    def test_retry_queue_event_source(self, template):
+        """Test that the retry queue is polled in batches and throttled at the poller."""
+        template.has_resource_properties(
+            "AWS::Lambda::EventSourceMapping",
+            {
+                "BatchSize": 10,
+                "MaximumBatchingWindowInSeconds": 5,
+                "ScalingConfig": {"MaximumConcurrency": 10},
+                "FunctionResponseTypes": ["ReportBatchItemFailures"],
+            },
+        )
+
+    def test_queues_use_sse_sqs(self, template):
+        """Test that every resilience queue is encrypted with SQS managed keys."""
+        queues = template.find_resources("AWS::SQS::Queue")
+        assert len(queues) == 3
+        assert all(queue["Properties"]["SqsManagedSseEnabled"] for queue in queues.values())
+
+    def test_circuit_breaker_warmup_rule(self, template):
+        """Test that the circuit breaker is pinged on a schedule."""
+        template.has_resource_properties(
+            "AWS::Events::Rule",
+            {
+                "Name": "n8n-test-circuit-breaker-warmup",
+                "ScheduleExpression": "rate(4 minutes)",
+                "Targets": [Match.object_like({"Input": json.dumps({"action": "warmup"})})],
+            },
+        )
+
+    def test_recovery_state_machine_forces_new_deployment(self, template):
+        """Test that recovery calls ecs:UpdateService from Step Functions."""
+        state_machines = template.find_resources(
+            "AWS::StepFunctions::StateMachine", {"Properties": {"StateMachineName": "n8n-test-recovery"}}
+        )
+        assert len(state_machines) == 1
+        definition = json.dumps(next(iter(state_machines.values()))["Properties"]["DefinitionString"])
+        assert "aws-sdk:ecs:updateService" in definition
+        assert "ForceNewDeployment" in definition
+
+        template.has_resource_properties(
+            "AWS::IAM::Policy",
+            {
+                "PolicyDocument": {
+                    "Statement": Match.array_with(
+                        [Match.object_like({"Action": "ecs:UpdateService", "Effect": "Allow"})]
+                    )
+                },
+                "Roles": [{"Ref": Match.string_like_regexp("RecoveryStateMachineRole")}],
+            },
+        )
+
+    def test_recovery_rule_targets_state_machine(self, template):
+        """Test that the no-running-tasks alarm starts the recovery state machine."""
+        template.has_resource_properties(
+            "AWS::Events::Rule",
+            {
+                "Name": "n8n-test-recovery",
+                "EventPattern": Match.object_like({"detail-type": ["CloudWatch Alarm State Change"]}),
+                "Targets": [Match.object_like({"Arn": {"Ref": Match.string_like_regexp("RecoveryStateMachine")}})],
+            },
+        )
+
+    def test_no_running_tasks_alarm_uses_health_check_metric(self, template):
+        """Test that zero running tasks is alarmed on the health check metric, not AWS/ECS."""
+        template.has_resource_properties(
+            "AWS::CloudWatch::Alarm",
+            {"Namespace": "N8n/Health", "MetricName": "NoRunningTasks"},
+        )
+        assert not template.find_resources("AWS::CloudWatch::Alarm", {"Properties": {"Namespace": "AWS/ECS"}})
+        assert not template.find_resources(
+            "AWS::CloudWatch::Alarm", {"Properties": {"Namespace": "ECS/ContainerInsights"}}
+        )
+
+    def test_container_insights_alarm_also_triggers_recovery(self):
+        """Test that Container Insights adds a recovery alarm that does not depend on the health check."""
+        template = synth_compute_stack(monitoring={"enable_container_insights": True})
+
+        alarms = template.find_resources(
+            "AWS::CloudWatch::Alarm",
+            {"Properties": {"Namespace": "ECS/ContainerInsights", "MetricName": "RunningTaskCount"}},
+        )
+        assert len(alarms) == 1
+        (alarm_id,) = alarms
+
+        (rule,) = template.find_resources("AWS::Events::Rule", {"Properties": {"Name": "n8n-test-recovery"}}).values()
+        assert {"Fn::GetAtt": [alarm_id, "Arn"]} in rule["Properties"]["EventPattern"]["resources"]
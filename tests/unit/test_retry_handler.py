@@ -0,0 +1,89 @@
+"""Unit tests for the retry handler Lambda."""
+
+import json
+import sys
+import types
+
+import pytest
+
+
+@pytest.fixture
+def retry_handler(load_handler, monkeypatch):
+    """Load the handler with a stand-in for the runtime's snapshot hooks."""
+    # Provided by the Lambda runtime only
+    monkeypatch.setitem(sys.modules, "snapshot_restore_py", types.SimpleNamespace(register_after_restore=lambda fn: fn))
+    return load_handler(
+        "retry_handler",
+        {"DLQ_URL": "https://sqs.example/dlq", "RETRY_QUEUE_URL": "https://sqs.example/retry", "ENVIRONMENT": "test"},
+    )
+
+
+def sqs_event(*bodies):
+    """Build an SQS event with one record per body."""
+    return {
+        "Records": [
+            {"messageId": f"msg-{i}", "body": body if isinstance(body, str) else json.dumps(body)}
+            for i, body in enumerate(bodies)
+        ]
+    }
+
+
+class TestRetryHandler:
+    """Test retry handler."""
+
+    def test_backoff_is_scheduled_on_the_queue(self, retry_handler, client):
+        """Test that every record in a batch is rescheduled with an SQS delay instead of sleeping."""
+        event = sqs_event({"workflow_id": "a", "retry_count": 0}, {"workflow_id": "b", "retry_count": 2})
+
+        assert retry_handler.handler(event, None) == {"batchItemFailures": []}
+        assert client.send_message.call_count == 2
+        first, second = (call.kwargs for call in client.send_message.call_args_list)
+        assert first["QueueUrl"] == "https://sqs.example/retry"
+        assert json.loads(first["MessageBody"]) == {"workflow_id": "a", "retry_count": 0, "scheduled": True}
+        assert first["DelaySeconds"] == 1
+        assert second["DelaySeconds"] == 4
+
+    def test_scheduled_message_is_retried(self, retry_handler, client):
+        """Test that a message that already waited out its backoff is retried."""
+        assert retry_handler._handle({"workflow_id": "a", "retry_count": 1, "scheduled": True}) == {
+            "status": "retried",
+            "retry_count": 2,
+        }
+        client.send_message.assert_not_called()
+
+    def test_delay_is_capped_at_sqs_limit(self, retry_handler, client, monkeypatch):
+        """Test that the delay never exceeds what SQS accepts."""
+        monkeypatch.setattr(retry_handler, "exponential_backoff", lambda retry_count: 5000)
+        retry_handler._handle({"workflow_id": "a"})
+
+        assert client.send_message.call_args.kwargs["DelaySeconds"] == 900
+
+    def test_exhausted_retries_go_to_dlq(self, retry_handler, client, emitted_metrics):
+        """Test that messages over the retry limit are sent to the DLQ and counted in one metric line."""
+        event = sqs_event({"workflow_id": "a", "retry_count": 3}, {"workflow_id": "b", "retry_count": 5})
+
+        assert retry_handler.handler(event, None) == {"batchItemFailures": []}
+        assert client.send_message.call_count == 2
+        assert client.send_message.call_args.kwargs["QueueUrl"] == "https://sqs.example/dlq"
+        (metric,) = emitted_metrics()
+        assert metric["RetryExhausted"] == 2
+        assert metric["Environment"] == "test"
+        assert metric["_aws"]["CloudWatchMetrics"] == [
+            {
+                "Namespace": "N8n/Retry",
+                "Dimensions": [["Environment"]],
+                "Metrics": [{"Name": "RetryExhausted", "Unit": "Count"}],
+            }
+        ]
+
+    def test_partial_batch_failure(self, retry_handler, client):
+        """Test that only the failing record is reported back to SQS."""
+        event = sqs_event({"workflow_id": "a", "scheduled": True}, "not json", {"workflow_id": "c", "scheduled": True})
+
+        assert retry_handler.handler(event, None) == {"batchItemFailures": [{"itemIdentifier": "msg-1"}]}
+
+    def test_exponential_backoff(self, retry_handler):
+        """Test backoff growth, jitter bound and cap."""
+        assert 1 <= retry_handler.exponential_backoff(0) <= 1.1
+        assert 8 <= retry_handler.exponential_backoff(3) <= 8.8
+        assert 300 <= retry_handler.exponential_backoff(20) <= 330
@@ -4,6 +4,7 @@ from unittest.mock import Mock
 
 import pytest
 from aws_cdk import App, Environment, RemovalPolicy
+from aws_cdk import aws_efs as efs
 from aws_cdk.assertions import Match, Template
 
 from n8n_deploy.config.models import (
@@ -13,6 +14,7 @@ from n8n_deploy.config.models import (
     EnvironmentSettings,
     GlobalConfig,
     N8nConfig,
+    NetworkingConfig,
 )
 from n8n_deploy.stacks.network_stack import NetworkStack
 from n8n_deploy.stacks.storage_stack import StorageStack
@@ -289,7 +291,7 @@ class TestStorageStack:
         )
 
         # Test volume configuration method
-        volume_config = stack.get_efs_volume_configuration()
+        volume_config = stack.efs_volume_configuration
 
         assert volume_config["name"] == "n8n-data"
         assert "efs_volume_configuration" in volume_config
@@ -432,3 +434,110 @@ class TestStorageStack:
                 network_stack=incomplete_network_stack,
                 env=Environment(account="123456789012", region="us-east-1"),
             )
+
+
+KMS_KEY_ARN = "arn:aws:kms:us-east-1:123456789012:key/1234abcd-12ab-34cd-56ef-1234567890ab"
+
+
+def build_storage_stack(efs_config=None, backup=None):
+    """Build a storage stack on a real network stack, so the template can be synthesized.
+
+    Args:
+        efs_config: Optional ``defaults.efs`` settings
+        backup: Optional backup configuration for the test environment
+
+    Returns:
+        StorageStack in a fresh app
+    """
+    config = N8nConfig(
+        global_config=GlobalConfig(project_name="test-n8n", organization="test-org"),
+        defaults=DefaultsConfig(efs=efs_config) if efs_config else None,
+        environments={
+            "test": EnvironmentConfig(
+                account="123456789012",
+                region="us-east-1",
+                settings=EnvironmentSettings(
+                    networking=NetworkingConfig(use_existing_vpc=False, vpc_cidr="10.0.0.0/16"),
+                    backup=backup,
+                ),
+            )
+        },
+    )
+    app = App()
+    env = Environment(account="123456789012", region="us-east-1")
+    network_stack = NetworkStack(app, "TestNetworkStack", config=config, environment="test", env=env)
+    return StorageStack(
+        app,
+        "TestStorageStack",
+        config=config,
+        environment="test",
+        network_stack=network_stack,
+        env=env,
+    )
+
+
+class TestStorageStackTemplate:
+    """Test the synthesized storage stack template."""
+
+    def test_elastic_throughput_by_default(self):
+        """Test that EFS defaults to elastic throughput without a provisioned rate."""
+        template = Template.from_stack(build_storage_stack())
+
+        template.has_resource_properties(
+            "AWS::EFS::FileSystem",
+            {"ThroughputMode": "elastic", "ProvisionedThroughputInMibps": Match.absent()},
+        )
+
+    def test_provisioned_throughput(self):
+        """Test that provisioned mode sets the configured throughput."""
+        stack = build_storage_stack({"throughput_mode": "provisioned", "provisioned_throughput_mibps": 64})
+
+        Template.from_stack(stack).has_resource_properties(
+            "AWS::EFS::FileSystem",
+            {"ThroughputMode": "provisioned", "ProvisionedThroughputInMibps": 64},
+        )
+
+    def test_bursting_throughput(self):
+        """Test that bursting mode is passed through and recorded for monitoring."""
+        stack = build_storage_stack({"throughput_mode": "bursting"})
+
+        assert stack.throughput_mode == efs.ThroughputMode.BURSTING
+        Template.from_stack(stack).has_resource_properties(
+            "AWS::EFS::FileSystem",
+            {"ThroughputMode": "bursting", "ProvisionedThroughputInMibps": Match.absent()},
+        )
+
+    def test_access_point_by_default(self):
+        """Test that the n8n access point and its outputs are created by default."""
+        stack = build_storage_stack()
+
+        template = Template.from_stack(stack)
+        template.resource_count_is("AWS::EFS::AccessPoint", 1)
+        assert {"AccessPointId", "AccessPointArn"} <= set(template.find_outputs("*"))
+        assert "access_point_id" in stack.efs_volume_configuration["efs_volume_configuration"]["authorization_config"]
+
+    def test_without_access_point(self):
+        """Test that the access point can be turned off in favour of mounting the root."""
+        stack = build_storage_stack({"use_access_point": False, "root_owned_by_n8n": True})
+
+        assert stack.n8n_access_point is None
+        template = Template.from_stack(stack)
+        template.resource_count_is("AWS::EFS::AccessPoint", 0)
+        assert not any("AccessPoint" in key for key in template.find_outputs("*"))
+        assert stack.efs_volume_configuration["efs_volume_configuration"]["authorization_config"] == {"iam": "ENABLED"}
+
+    def test_backup_vault_uses_aws_managed_key_by_default(self):
+        """Test that the backup vault sets no key unless one is configured."""
+        stack = build_storage_stack(backup=BackupConfig(enabled=True, retention_days=7))
+
+        Template.from_stack(stack).has_resource_properties(
+            "AWS::Backup::BackupVault", {"EncryptionKeyArn": Match.absent()}
+        )
+
+    def test_backup_vault_uses_shared_kms_key(self):
+        """Test that a configured customer managed key encrypts the backup vault."""
+        stack = build_storage_stack(backup=BackupConfig(enabled=True, retention_days=7, kms_key_arn=KMS_KEY_ARN))
+
+        Template.from_stack(stack).has_resource_properties(
+            "AWS::Backup::BackupVault", {"EncryptionKeyArn": KMS_KEY_ARN}
+        )
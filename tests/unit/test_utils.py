@@ -0,0 +1,21 @@
+"""Unit tests for shared helpers."""
+
+import pytest
+
+from n8n_deploy._utils import nearest
+
+
+class TestNearest:
+    """Test nearest key lookup."""
+
+    @pytest.mark.parametrize(
+        "value,expected",
+        [(0, 1), (1, 1), (4, 1), (5, 7), (30, 30), (45, 30), (46, 60), (200, 180), (300, 270), (1000, 365)],
+    )
+    def test_rounds_to_nearest_key(self, value, expected):
+        """Test that the nearest key wins and ties go to the smaller one."""
+        assert nearest((1, 7, 14, 30, 60, 90, 180, 270, 365), value) == expected
+
+    def test_single_key(self):
+        """Test that a single key is always returned."""
+        assert nearest((30,), 0) == nearest((30,), 1000) == 30